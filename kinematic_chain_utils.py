@@ -6,6 +6,9 @@ including hip rotation, shoulder rotation, knee bend, trunk lean, and upper arm
 """
 
 import math
+import numbers
+
+import numpy as np
 
 
 def calculate_hip_rotation(landmarks):
@@ -312,6 +315,106 @@ def calculate_upper_arm_angle(landmarks, side='right'):
         return 0.0
 
 
+# Batch variants
+#
+# Each takes one (N, 3) array of x, y, z per landmark (see landmarks_to_array)
+# and returns an (N,) array of angles in degrees, matching the per-frame
+# functions above case by case, including their defaults for missing (NaN)
+# landmarks and degenerate vectors. Extra columns are ignored, so rows in the
+# [x, y, z, visibility] layout of VideoProcessor's landmarks_array work as is.
+
+# Landmark fields in the order of the last axis of landmark arrays
+LANDMARK_FIELDS = ('x', 'y', 'z', 'visibility')
+
+
+def landmarks_to_array(landmarks_list, names, dtype=np.float64, fields=LANDMARK_FIELDS[:3]):
+    """
+    Stack the fields (default x, y, z) of the named landmarks from landmark dicts.
+
+    Args:
+        landmarks_list (list): Landmark dicts, as passed to the functions above
+        names (sequence): Landmark names, in the order of axis 1 of the result
+        dtype: Output dtype (default: float64)
+        fields (sequence): Fields, in the order of axis 2 of the result. Pass
+            LANDMARK_FIELDS to include visibility, as in VideoProcessor's
+            landmarks_array.
+
+    Returns:
+        np.ndarray: (len(landmarks_list), len(names), len(fields)) array.
+            Fields that are missing or not numbers (and whole missing
+            landmarks) are NaN.
+
+    Example:
+        >>> xyz = landmarks_to_array(cases, ('left_hip', 'right_hip'))
+        >>> angles = calculate_hip_rotation_batch(xyz[:, 0], xyz[:, 1])
+    """
+    out = np.full((len(landmarks_list), len(names), len(fields)), np.nan, dtype=dtype)
+    for i, landmarks in enumerate(landmarks_list):
+        for j, name in enumerate(names):
+            landmark = landmarks.get(name)
+            if not isinstance(landmark, dict):
+                continue
+            # Per field, since some functions only read some of them
+            for k, field in enumerate(fields):
+                value = landmark.get(field)
+                if isinstance(value, numbers.Real):
+                    out[i, j, k] = value
+    return out
+
+
+def _rotation_batch(left, right):
+    """Angle of the left→right line in the x-z plane, 0.0 where undefined."""
+    angles = np.degrees(np.arctan2(right[:, 2] - left[:, 2], right[:, 0] - left[:, 0]))
+    return np.where(np.isnan(angles), 0.0, angles)
+
+
+def _vector_angle_batch(u, v, default):
+    """Angle between row vectors u and v; default where missing or zero length."""
+    norms = np.linalg.norm(u, axis=-1) * np.linalg.norm(v, axis=-1)
+    valid = norms > 0  # False for NaN too
+    cosine = np.einsum('ij,ij->i', u, v) / np.where(valid, norms, 1.0)
+    angles = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+    return np.where(valid, angles, default)
+
+
+def _triad_angle_batch(a, vertex, c, default):
+    """Angle a-vertex-c at vertex (the 3-joint angle); default where undefined."""
+    vertex = vertex[:, :3]
+    return _vector_angle_batch(a[:, :3] - vertex, c[:, :3] - vertex, default)
+
+
+def calculate_hip_rotation_batch(left_hip, right_hip):
+    """Batch calculate_hip_rotation over (N, 3) hip coordinate arrays."""
+    return _rotation_batch(left_hip, right_hip)
+
+
+def calculate_shoulder_rotation_batch(left_shoulder, right_shoulder):
+    """Batch calculate_shoulder_rotation over (N, 3) shoulder coordinate arrays."""
+    return _rotation_batch(left_shoulder, right_shoulder)
+
+
+def calculate_knee_bend_batch(hip, knee, ankle):
+    """Batch calculate_knee_bend over (N, 3) hip, knee and ankle arrays of one leg."""
+    return _triad_angle_batch(hip, knee, ankle, default=180.0)
+
+
+def calculate_trunk_lean_batch(left_hip, right_hip, left_shoulder, right_shoulder):
+    """Batch calculate_trunk_lean over (N, 3) hip and shoulder coordinate arrays."""
+    trunk = ((left_shoulder[:, :3] + right_shoulder[:, :3]) / 2
+             - (left_hip[:, :3] + right_hip[:, :3]) / 2)
+    angles = np.degrees(np.arctan2(trunk[:, 2], -trunk[:, 1]))
+    # x isn't used, but a landmark missing it still counts as missing
+    return np.where(np.isnan(trunk).any(axis=1), 0.0, angles)
+
+
+def calculate_upper_arm_angle_batch(shoulder, elbow, hip):
+    """Batch calculate_upper_arm_angle over (N, 3) shoulder, elbow and hip arrays."""
+    # Trunk line: the point straight below (or above) the shoulder at hip height
+    trunk_point = shoulder[:, :3].copy()
+    trunk_point[:, 1] = hip[:, 1]
+    return _triad_angle_batch(elbow, shoulder, trunk_point, default=0.0)
+
+
 # Helper function for testing
 def create_sample_landmarks():
     """
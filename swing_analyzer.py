@@ -1,129 +1,150 @@
-from utils import (
-    calculate_angle,
-    calculate_velocity,
-    get_body_center_x,
-    is_wrist_behind_body,
-)
-from kinematic_chain_utils import (
-    calculate_hip_rotation,
-    calculate_shoulder_rotation,
-    calculate_knee_bend,
-    calculate_trunk_lean,
-)
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from itertools import repeat
+from operator import itemgetter
+from types import MappingProxyType
+
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from utils import LANDMARK_NAMES
+from kinematic_chain_utils import LANDMARK_FIELDS, calculate_knee_bend, landmarks_to_array
 from analysis_results import SwingAnalysisResults
 
 
+# Per-frame metrics produced by SwingAnalyzer._calculate_frame_metrics, one
+# record per valid frame. Angles, positions and velocities are float32 (pose
+# coordinates are normalized and don't need double precision)
+FRAME_METRIC_DTYPE = np.dtype([
+    ("frame_number", "i4"),
+    ("timestamp", "f8"),
+    ("elbow_angle", "f4"),
+    ("wrist_velocity", "f4"),
+    ("wrist_x", "f4"),
+    ("wrist_behind_body", "?"),
+    ("body_center_x", "f4"),
+    ("hip_rotation", "f4"),
+    ("shoulder_rotation", "f4"),
+    ("knee_bend", "f4"),
+    ("trunk_lean", "f4"),
+    ("hip_velocity", "f4"),
+    ("shoulder_velocity", "f4"),
+    ("elbow_velocity", "f4"),
+])
+
+# Bound once so stacking landmarks does a single C-level lookup per frame and
+# per landmark instead of a Python-level subscript for every coordinate. They
+# require every landmark and coordinate, so callers fall back to
+# landmarks_to_array (NaN for anything missing) when one isn't there
+_get_tracked_landmarks = itemgetter(*LANDMARK_NAMES)
+_get_xyz = itemgetter("x", "y", "z")
+_get_xyzv = itemgetter("x", "y", "z", "visibility")
+
+# Indices into axis 1 of landmark tensors (LANDMARK_NAMES order)
+_LS, _RS, _LE, _RE, _LW, _RW, _LH, _RH = range(len(LANDMARK_NAMES))
+
+
+def _failed_phase(reason, **extra):
+    """Read-only template of a phase entry for a phase that wasn't detected."""
+    return MappingProxyType({"detected": False, "confidence": 0.0, "reason": reason, **extra})
+
+
+# Phase results when no backswing start is found, by (failure reason, contact
+# detection method). No later phase can be detected without it, so these are
+# built once; _detect_phases hands out plain dict copies, like on success
+_NO_BACKSWING_PHASES = {
+    (reason, method): MappingProxyType({
+        "backswing_start": _failed_phase(reason),
+        "max_backswing": _failed_phase("backswing_start_not_detected"),
+        "forward_swing_start": _failed_phase("max_backswing_not_detected"),
+        "contact": _failed_phase("forward_swing_start_not_detected", method=method),
+        "follow_through": _failed_phase("contact_not_detected"),
+        "_analysis_quality": MappingProxyType({
+            "overall_score": 0.0,
+            "phases_detected": 0,
+            "total_phases": 5,
+            "detection_rate": 0.0
+        }),
+    })
+    for reason in ("insufficient_body_rotation", "wrist_never_behind_body")
+    for method in ("velocity_peak", "kinematic_chain", "hybrid")
+}
+
+
+@dataclass(slots=True, frozen=True)
 class SwingAnalyzerConfig:
     """
     Configuration class for swing phase detection.
 
+    Configs are immutable, so presets can be shared safely between
+    analyzers, threads and worker processes.
+
     Attributes:
-        velocity_threshold (float): Fixed minimum wrist velocity for swing detection
-        contact_angle_min (int): Minimum elbow extension angle at contact (degrees)
+        velocity_threshold (float): Fixed minimum wrist velocity for swing detection (default: 0.5)
+            Higher values = require faster motion to detect swing
+        contact_angle_min (int): Minimum elbow extension angle at contact in degrees (default: 150)
+            Higher values = require straighter arm at contact
         use_adaptive_velocity (bool): Use percentage of max velocity instead of fixed threshold
-        adaptive_velocity_percent (float): Percentage of max velocity to use as threshold
-        contact_frame_offset (int): Frames to adjust forward after peak velocity for contact
-        follow_through_offset (float): Wrist position threshold past body center (normalized 0-1)
-        forward_swing_search_window (int): Maximum frames to search for contact point
-        min_valid_frames (int): Minimum frames with pose detected required for analysis
-        wrist_behind_body_threshold (float): X-position threshold relative to body center
+            Recommended for videos with varying speeds
+        adaptive_velocity_percent (float): Percentage of max velocity to use as threshold (default: 0.15 = 15%)
+            Lower values = detect slower swings, higher values = only fast swings
+        contact_frame_offset (int): Frames to adjust forward after peak velocity for contact (default: 3)
+            Accounts for lag between velocity peak and actual contact
+        follow_through_offset (float): Wrist position threshold past body center (default: 0.15)
+            Normalized coordinate offset (0.0-1.0 scale)
+        forward_swing_search_window (int): Maximum frames to search for contact point (default: 40)
+            Larger window = more lenient search, smaller = stricter timing
+        min_valid_frames (int): Minimum frames with pose detected required for analysis (default: 10)
+            Videos with fewer valid frames will be rejected
+        wrist_behind_body_threshold (float): X-position threshold relative to body center (default: 0.0)
+            Currently unused, reserved for future backswing detection refinements
         kinematic_chain_mode (bool): Enable multi-joint kinematic chain analysis for phase detection
+            If True, uses hip rotation, shoulder rotation, and proximal-to-distal sequencing
+            If False, uses traditional single-point wrist tracking (backward compatible)
         contact_detection_method (str): Method for detecting contact point:
             'velocity_peak' - Traditional method using wrist velocity peak
             'kinematic_chain' - Biomechanical method using shoulder→elbow→wrist sequencing
             'hybrid' - Try both methods and use voting/best confidence
+        verbose (bool): Print configuration and progress messages (default: True)
+            Set to False for batch processing; errors are still reported
     """
 
-    def __init__(
-        self,
-        velocity_threshold=0.5,
-        contact_angle_min=150,
-        use_adaptive_velocity=False,
-        adaptive_velocity_percent=0.15,
-        contact_frame_offset=3,
-        follow_through_offset=0.15,
-        forward_swing_search_window=40,
-        min_valid_frames=10,
-        wrist_behind_body_threshold=0.0,
-        kinematic_chain_mode=False,
-        contact_detection_method='velocity_peak',
-    ):
-        """
-        Initialize swing analyzer configuration.
-
-        Args:
-            velocity_threshold: Fixed minimum wrist velocity for swing detection (default: 0.5)
-                Higher values = require faster motion to detect swing
-            contact_angle_min: Minimum elbow extension angle at contact in degrees (default: 150)
-                Higher values = require straighter arm at contact
-            use_adaptive_velocity: If True, uses percentage of max velocity instead of fixed threshold
-                Recommended for videos with varying speeds
-            adaptive_velocity_percent: Percentage of max velocity to use as threshold (default: 0.15 = 15%)
-                Lower values = detect slower swings, higher values = only fast swings
-            contact_frame_offset: Frames to adjust forward after detecting peak velocity (default: 3)
-                Accounts for lag between velocity peak and actual contact
-            follow_through_offset: Wrist X-position past body center to trigger follow-through (default: 0.15)
-                Normalized coordinate offset (0.0-1.0 scale)
-            forward_swing_search_window: Maximum frames to search ahead for contact point (default: 40)
-                Larger window = more lenient search, smaller = stricter timing
-            min_valid_frames: Minimum frames with pose detected required for analysis (default: 10)
-                Videos with fewer valid frames will be rejected
-            wrist_behind_body_threshold: X-position threshold relative to body center (default: 0.0)
-                Currently unused, reserved for future backswing detection refinements
-            kinematic_chain_mode: Enable multi-joint kinematic chain analysis (default: False)
-                If True, uses hip rotation, shoulder rotation, and proximal-to-distal sequencing
-                If False, uses traditional single-point wrist tracking (backward compatible)
-            contact_detection_method: Method for detecting contact (default: 'velocity_peak')
-                'velocity_peak' - Traditional wrist velocity peak detection
-                'kinematic_chain' - Shoulder→elbow→wrist sequencing detection
-                'hybrid' - Try both and use best confidence
-        """
-        # Validate parameters
-        if velocity_threshold < 0:
+    velocity_threshold: float = 0.5
+    contact_angle_min: int = 150
+    use_adaptive_velocity: bool = False
+    adaptive_velocity_percent: float = 0.15
+    contact_frame_offset: int = 3
+    follow_through_offset: float = 0.15
+    forward_swing_search_window: int = 40
+    min_valid_frames: int = 10
+    wrist_behind_body_threshold: float = 0.0
+    kinematic_chain_mode: bool = False
+    contact_detection_method: str = 'velocity_peak'
+    verbose: bool = True
+
+    def __post_init__(self):
+        """Validate parameters."""
+        if self.velocity_threshold < 0:
             raise ValueError("velocity_threshold must be non-negative")
-        if not 0 <= contact_angle_min <= 180:
+        if not 0 <= self.contact_angle_min <= 180:
             raise ValueError("contact_angle_min must be between 0 and 180 degrees")
-        if not 0.0 < adaptive_velocity_percent < 1.0:
+        if not 0.0 < self.adaptive_velocity_percent < 1.0:
             raise ValueError("adaptive_velocity_percent must be between 0.0 and 1.0")
-        if contact_frame_offset < 0:
+        if self.contact_frame_offset < 0:
             raise ValueError("contact_frame_offset must be non-negative")
-        if not 0.0 <= follow_through_offset <= 1.0:
+        if not 0.0 <= self.follow_through_offset <= 1.0:
             raise ValueError("follow_through_offset must be between 0.0 and 1.0")
-        if forward_swing_search_window < 1:
+        if self.forward_swing_search_window < 1:
             raise ValueError("forward_swing_search_window must be at least 1")
-        if min_valid_frames < 1:
+        if self.min_valid_frames < 1:
             raise ValueError("min_valid_frames must be at least 1")
-        if not isinstance(kinematic_chain_mode, bool):
+        if not isinstance(self.kinematic_chain_mode, bool):
             raise ValueError("kinematic_chain_mode must be a boolean")
-        if contact_detection_method not in ['velocity_peak', 'kinematic_chain', 'hybrid']:
+        if self.contact_detection_method not in ['velocity_peak', 'kinematic_chain', 'hybrid']:
             raise ValueError("contact_detection_method must be 'velocity_peak', 'kinematic_chain', or 'hybrid'")
 
-        self.velocity_threshold = velocity_threshold
-        self.contact_angle_min = contact_angle_min
-        self.use_adaptive_velocity = use_adaptive_velocity
-        self.adaptive_velocity_percent = adaptive_velocity_percent
-        self.contact_frame_offset = contact_frame_offset
-        self.follow_through_offset = follow_through_offset
-        self.forward_swing_search_window = forward_swing_search_window
-        self.min_valid_frames = min_valid_frames
-        self.wrist_behind_body_threshold = wrist_behind_body_threshold
-        self.kinematic_chain_mode = kinematic_chain_mode
-        self.contact_detection_method = contact_detection_method
-
-    def __repr__(self):
-        return (
-            f"SwingAnalyzerConfig("
-            f"velocity_threshold={self.velocity_threshold}, "
-            f"contact_angle_min={self.contact_angle_min}, "
-            f"use_adaptive_velocity={self.use_adaptive_velocity}, "
-            f"adaptive_velocity_percent={self.adaptive_velocity_percent}, "
-            f"contact_frame_offset={self.contact_frame_offset}, "
-            f"follow_through_offset={self.follow_through_offset}, "
-            f"forward_swing_search_window={self.forward_swing_search_window}, "
-            f"min_valid_frames={self.min_valid_frames}, "
-            f"kinematic_chain_mode={self.kinematic_chain_mode}, "
-            f"contact_detection_method={self.contact_detection_method})"
-        )
+
+_CONFIG_FIELDS = frozenset(field.name for field in fields(SwingAnalyzerConfig))
 
 
 # Preset configurations
@@ -144,6 +165,8 @@ PRESET_STRICT = SwingAnalyzerConfig(
 
 
 class SwingAnalyzer:
+    __slots__ = ("config", "_contact_phase", "_metrics_cache")
+
     def __init__(self, config=None, **kwargs):
         """
         Initialize swing analyzer with configurable thresholds.
@@ -177,31 +200,48 @@ class SwingAnalyzer:
 
         self.config = config
 
-        # Store config values as instance variables for easy access
-        self.velocity_threshold = config.velocity_threshold
-        self.contact_angle_min = config.contact_angle_min
-        self.use_adaptive_velocity = config.use_adaptive_velocity
-        self.adaptive_velocity_percent = config.adaptive_velocity_percent
-        self.contact_frame_offset = config.contact_frame_offset
-        self.follow_through_offset = config.follow_through_offset
-        self.forward_swing_search_window = config.forward_swing_search_window
-        self.min_valid_frames = config.min_valid_frames
-        self.wrist_behind_body_threshold = config.wrist_behind_body_threshold
-        self.kinematic_chain_mode = config.kinematic_chain_mode
-        self.contact_detection_method = config.contact_detection_method
-
-        # Print configuration
-        print("⚙️  Swing Analyzer Config:")
-        print(f"   Velocity threshold: {self.velocity_threshold}")
-        print(f"   Contact angle min: {self.contact_angle_min}°")
-        print(f"   Adaptive velocity: {self.use_adaptive_velocity}")
-        if self.use_adaptive_velocity:
-            print(f"   Adaptive percent: {self.adaptive_velocity_percent * 100:.0f}%")
-        print(f"   Contact frame offset: {self.contact_frame_offset}")
-        print(f"   Follow-through offset: {self.follow_through_offset}")
-        print(f"   Search window: {self.forward_swing_search_window} frames")
-        print(f"   Kinematic chain mode: {self.kinematic_chain_mode}")
-        print(f"   Contact detection method: {self.contact_detection_method}")
+        # Contact detection is fixed by the config, so pick the detector once
+        # instead of dispatching on the method name for every video
+        self._contact_phase = {
+            'velocity_peak': self._contact_phase_velocity_peak,
+            'kinematic_chain': self._contact_phase_kinematic_chain,
+            'hybrid': self._contact_phase_hybrid,
+        }[config.contact_detection_method]
+
+        # Frame metrics of the last analyzed video, reused when the same
+        # video_data is analyzed again (they don't depend on thresholds)
+        self._metrics_cache = None
+
+        # Print configuration, as a single write so it stays cheap on slow or
+        # line-buffered sinks when many analyzers are created
+        if config.verbose:
+            lines = [
+                "⚙️  Swing Analyzer Config:",
+                f"   Velocity threshold: {config.velocity_threshold}",
+                f"   Contact angle min: {config.contact_angle_min}°",
+                f"   Adaptive velocity: {config.use_adaptive_velocity}",
+            ]
+            if config.use_adaptive_velocity:
+                lines.append(f"   Adaptive percent: {config.adaptive_velocity_percent * 100:.0f}%")
+            lines += [
+                f"   Contact frame offset: {config.contact_frame_offset}",
+                f"   Follow-through offset: {config.follow_through_offset}",
+                f"   Search window: {config.forward_swing_search_window} frames",
+                f"   Kinematic chain mode: {config.kinematic_chain_mode}",
+                f"   Contact detection method: {config.contact_detection_method}",
+            ]
+            print("\n".join(lines))
+
+    def __getattr__(self, name):
+        """
+        Read-only access to config fields on the analyzer (e.g. analyzer.velocity_threshold).
+
+        Only called for names not found on the instance; the config is the
+        single source of truth for thresholds.
+        """
+        if name in _CONFIG_FIELDS:
+            return getattr(self.config, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
     def analyze_swing(self, video_data):
         """
@@ -216,6 +256,8 @@ class SwingAnalyzer:
                 - video_quality: Video quality assessment
                 - tracking_quality: Pose tracking quality
         """
+        cfg = self.config
+
         frames = video_data["frames"]
         fps = video_data["fps"]
 
@@ -226,123 +268,139 @@ class SwingAnalyzer:
         if 'tracking_quality' in video_data:
             results.set_tracking_quality(video_data['tracking_quality'])
 
-        # Filter to only frames with pose detected
-        valid_frames = [f for f in frames if f["pose_detected"]]
+        # Filter to only frames with pose detected, using the processor's
+        # detection mask when available
+        pose_detected = video_data.get("pose_detected")
+        if pose_detected is None:
+            pose_detected = np.fromiter(
+                (f["pose_detected"] for f in frames), dtype=bool, count=len(frames)
+            )
+        valid_idx = np.flatnonzero(pose_detected)
 
-        if len(valid_frames) < self.min_valid_frames:
+        if valid_idx.size < cfg.min_valid_frames:
             # Return empty results with error information
-            print(f"❌ Error: Not enough frames with pose detected (need at least {self.min_valid_frames})")
-            print(f"   Frames detected: {len(valid_frames)}")
+            print(
+                f"❌ Error: Not enough frames with pose detected (need at least {cfg.min_valid_frames})\n"
+                f"   Frames detected: {valid_idx.size}"
+            )
             return results
 
-        print(f"Analyzing {len(valid_frames)} valid frames...")
+        valid_frames = [frames[i] for i in valid_idx]
+
+        if cfg.verbose:
+            print(f"Analyzing {len(valid_frames)} valid frames...")
 
-        # Calculate metrics for each frame
-        frame_metrics = self._calculate_frame_metrics(valid_frames, fps)
+        # Calculate metrics for each frame (or reuse them for the same video)
+        frame_metrics = self._get_frame_metrics(video_data, valid_idx, valid_frames, fps)
 
         # If using adaptive velocity, calculate it from the data
-        velocity_threshold = self.velocity_threshold
-        if self.use_adaptive_velocity:
-            velocities = [m["wrist_velocity"] for m in frame_metrics]
-            max_velocity = max(velocities)
-            velocity_threshold = max_velocity * self.adaptive_velocity_percent
-            print("\n📊 Adaptive Velocity Analysis:")
-            print(f"   Max velocity: {max_velocity:.4f}")
-            print(
-                f"   Calculated threshold: {velocity_threshold:.4f} ({self.adaptive_velocity_percent * 100:.0f}% of max)"
-            )
+        velocity_threshold = cfg.velocity_threshold
+        if cfg.use_adaptive_velocity:
+            max_velocity = float(frame_metrics["wrist_velocity"].max())
+            velocity_threshold = max_velocity * cfg.adaptive_velocity_percent
+            if cfg.verbose:
+                print(
+                    "\n📊 Adaptive Velocity Analysis:\n"
+                    f"   Max velocity: {max_velocity:.4f}\n"
+                    f"   Calculated threshold: {velocity_threshold:.4f} ({cfg.adaptive_velocity_percent * 100:.0f}% of max)"
+                )
 
         # Detect swing phases (legacy method returns dict)
-        phases_dict = self._detect_phases(frame_metrics, valid_frames, velocity_threshold, self.kinematic_chain_mode)
+        phases_dict = self._detect_phases(frame_metrics, valid_frames, velocity_threshold, cfg.kinematic_chain_mode)
 
         # Populate SwingAnalysisResults from phases_dict
         self._populate_results_from_phases(results, phases_dict, frame_metrics, fps)
 
         return results
 
-    def _calculate_frame_metrics(self, frames, fps):
-        """Calculate angles and velocities for each frame"""
-        metrics = []
+    def analyze_many(self, video_data_list, max_workers=None):
+        """
+        Analyze several videos in parallel, one worker process per video.
 
-        for i, frame in enumerate(frames):
-            landmarks = frame["landmarks"]
+        Videos are independent, so they are spread over a process pool
+        (frame metrics are CPU bound and would serialize on the GIL in threads).
 
-            # Calculate elbow angle (shoulder-elbow-wrist)
-            elbow_angle = calculate_angle(
-                landmarks["right_shoulder"],
-                landmarks["right_elbow"],
-                landmarks["right_wrist"],
-            )
+        Args:
+            video_data_list: List of video_data dicts from VideoProcessor.process_video
+            max_workers: Number of worker processes (default: number of CPUs).
+                With 1 worker, or a single video, analysis runs in this process.
 
-            # Calculate wrist velocity (if not first frame)
-            wrist_velocity = 0
-            if i > 0:
-                prev_wrist = frames[i - 1]["landmarks"]["right_wrist"]
-                curr_wrist = landmarks["right_wrist"]
-                time_delta = 1 / fps
-                wrist_velocity = calculate_velocity(curr_wrist, prev_wrist, time_delta)
-
-            # Check if wrist is behind body
-            wrist_behind = is_wrist_behind_body(
-                landmarks["right_wrist"],
-                landmarks["left_shoulder"],
-                landmarks["right_shoulder"],
+        Returns:
+            list[SwingAnalysisResults]: Results in the same order as video_data_list
+        """
+        video_data_list = list(video_data_list)
+        if max_workers == 1 or len(video_data_list) <= 1:
+            return [self.analyze_swing(video_data) for video_data in video_data_list]
+
+        # Workers build their own analyzer from the config, so the metrics
+        # cache of this instance isn't pickled along with every video
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(_analyze_in_worker, repeat(self.config), video_data_list)
             )
 
-            # Get body center for reference
-            body_center = get_body_center_x(
-                landmarks["left_shoulder"], landmarks["right_shoulder"]
-            )
+    def _get_frame_metrics(self, video_data, valid_idx, valid_frames, fps):
+        """
+        Return frame metrics for video_data, computing them only on a cache miss.
 
-            # ===== KINEMATIC CHAIN METRICS =====
-            # Calculate kinematic chain angles
-            hip_rotation = calculate_hip_rotation(landmarks)
-            shoulder_rotation = calculate_shoulder_rotation(landmarks)
-            knee_bend = calculate_knee_bend(landmarks, side='right')
-            trunk_lean = calculate_trunk_lean(landmarks)
-
-            # Calculate velocities for kinematic chain (if not first frame)
-            hip_velocity = 0
-            shoulder_velocity = 0
-            elbow_velocity = 0
-            if i > 0:
-                prev_landmarks = frames[i - 1]["landmarks"]
-                prev_hip_rotation = calculate_hip_rotation(prev_landmarks)
-                prev_shoulder_rotation = calculate_shoulder_rotation(prev_landmarks)
-                prev_elbow = prev_landmarks["right_elbow"]
-                curr_elbow = landmarks["right_elbow"]
-
-                time_delta = 1 / fps
-                # Angular velocity = change in angle / time
-                hip_velocity = abs(hip_rotation - prev_hip_rotation) / time_delta
-                shoulder_velocity = abs(shoulder_rotation - prev_shoulder_rotation) / time_delta
-                # Linear velocity for elbow (similar to wrist)
-                elbow_velocity = calculate_velocity(curr_elbow, prev_elbow, time_delta)
-
-            metrics.append(
-                {
-                    "frame_number": frame["frame_number"],
-                    "timestamp": frame["timestamp"],
-                    # Existing fields
-                    "elbow_angle": elbow_angle,
-                    "wrist_velocity": wrist_velocity,
-                    "wrist_x": landmarks["right_wrist"]["x"],
-                    "wrist_behind_body": wrist_behind,
-                    "body_center_x": body_center,
-                    # Kinematic chain fields
-                    "hip_rotation": hip_rotation,
-                    "shoulder_rotation": shoulder_rotation,
-                    "knee_bend": knee_bend,
-                    "trunk_lean": trunk_lean,
-                    "hip_velocity": hip_velocity,
-                    "shoulder_velocity": shoulder_velocity,
-                    "elbow_velocity": elbow_velocity,
-                }
-            )
+        The cache holds a reference to the frames list of the last analyzed
+        video, so its identity can be compared safely (ids are never reused
+        while the object is alive).
+
+        Landmark coordinates come from video_data['landmarks_array'] when
+        VideoProcessor supplied it. Otherwise they are built from the frames
+        for this analysis only; video_data is never modified, so edited
+        frames are picked up by the next analyzer.
+        """
+        frames = video_data["frames"]
+        key = (id(video_data), fps, len(frames))
+
+        cached = self._metrics_cache
+        if cached is not None and cached[0] == key and cached[1] is frames:
+            return cached[2]
+
+        landmarks_array = video_data.get("landmarks_array")
+        if landmarks_array is None:
+            landmarks_array = _landmarks_array(frames)
+
+        frame_metrics = self._calculate_frame_metrics(
+            valid_frames, fps, landmarks=landmarks_array[valid_idx, :, :3]
+        )
+        self._metrics_cache = (key, frames, frame_metrics)
+        return frame_metrics
+
+    def _calculate_frame_metrics(self, frames, fps, landmarks=None):
+        """
+        Calculate angles and velocities for each frame
+
+        Landmarks are stacked into one (N, K, 3) tensor (unless given as
+        landmarks) and the metric columns are computed from it by
+        _compute_frame_metrics.
+
+        Returns:
+            np.ndarray: Structured array with FRAME_METRIC_DTYPE, one record per frame
+        """
+        metrics = np.empty(len(frames), dtype=FRAME_METRIC_DTYPE)
+        metrics["frame_number"] = [frame["frame_number"] for frame in frames]
+        metrics["timestamp"] = [frame["timestamp"] for frame in frames]
+
+        if landmarks is None:
+            landmarks = _landmark_tensor(frames)
+        _compute_frame_metrics(metrics, landmarks, fps)
+
+        # Knees and ankles aren't part of the tracked landmark set, so this
+        # stays a per-frame call (180.0 when they're missing)
+        metrics["knee_bend"] = np.fromiter(
+            (calculate_knee_bend(frame["landmarks"], side='right') for frame in frames),
+            dtype=np.float32,
+            count=len(frames),
+        )
 
         return metrics
 
-    def _detect_contact_kinematic_chain(self, metrics, forward_idx, velocity_threshold):
+    def _detect_contact_kinematic_chain(
+        self, metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+    ):
         """
         Detect contact using kinematic chain sequencing (shoulder→elbow→wrist).
 
@@ -353,90 +411,306 @@ class SwingAnalyzer:
         - Proper velocity sequencing: shoulder < elbow < wrist
 
         Args:
-            metrics: List of frame metrics
+            metrics: Structured array of frame metrics (FRAME_METRIC_DTYPE)
             forward_idx: Index of forward swing start
+            search_window_end: End (exclusive) of the contact search window
+            window_velocity: float64 wrist velocity over metrics[forward_idx:search_window_end]
             velocity_threshold: Velocity threshold for detection
 
         Returns:
-            tuple: (contact_metric_dict or None, confidence_score)
+            tuple: (contact index into metrics or None, confidence_score,
+            dict of the contact's sequencing scores or None)
         """
-        search_window_end = min(forward_idx + self.forward_swing_search_window, len(metrics))
-        contact_candidates = []
+        cfg = self.config
+        contact_angle_min = cfg.contact_angle_min
+
+        # Candidates start one frame after forward swing start
+        start = forward_idx + 1
+        window = metrics[start:search_window_end]
+        wrist_velocity = window_velocity[1:]
+        elbow_velocity = window["elbow_velocity"].astype(np.float64)
+
+        candidates = (
+            # Elbow at high velocity (middle of kinematic chain)
+            (elbow_velocity > velocity_threshold * 0.6)  # Lowered from 0.8
+            # Wrist at peak velocity (distal end - fastest)
+            & (wrist_velocity > velocity_threshold)
+            # Velocity sequencing: wrist should be fastest (most important)
+            # This is the key kinematic chain principle: distal segment (wrist) moves faster than proximal (elbow)
+            & (wrist_velocity > elbow_velocity)
+            # Arm should be extended at contact
+            & (window["elbow_angle"] > contact_angle_min)
+            # Wrist should be in front of body
+            & ~window["wrist_behind_body"]
+        )
 
-        for i in range(forward_idx + 1, search_window_end):
-            m = metrics[i]
+        if not candidates.any():
+            return None, 0.0, None
 
-            # Check elbow at high velocity (middle of kinematic chain)
-            elbow_high_velocity = m["elbow_velocity"] > velocity_threshold * 0.6  # Lowered from 0.8
+        # Choose best candidate based on wrist velocity (contact occurs at peak)
+        best_idx = start + int(np.argmax(np.where(candidates, wrist_velocity, -np.inf)))
+        m = _metric_row(metrics, best_idx)
+
+        # Calculate sequencing quality score based on velocity gradient
+        # Higher gradient (wrist much faster than elbow) = better kinematic chain
+        velocity_gradient = m["wrist_velocity"] - m["elbow_velocity"]
+        sequencing_quality = min(1.0, velocity_gradient / 0.5)  # Full score at 0.5 difference
+
+        # Velocity ratios (how well does it follow shoulder < elbow < wrist)
+        elbow_wrist_ratio = m["elbow_velocity"] / m["wrist_velocity"] if m["wrist_velocity"] > 0 else 0
+        shoulder_elbow_ratio = m["shoulder_velocity"] / m["elbow_velocity"] if m["elbow_velocity"] > 0 else 0
+
+        # Ideal ratios: shoulder ~ 0.5-0.7 * elbow, elbow ~ 0.6-0.8 * wrist
+        ratio_score = (
+            (1.0 - abs(shoulder_elbow_ratio - 0.6)) +  # Penalize deviation from 0.6
+            (1.0 - abs(elbow_wrist_ratio - 0.7))      # Penalize deviation from 0.7
+        ) / 2.0
+        ratio_score = max(0.0, min(1.0, ratio_score))
+
+        # Velocity score
+        velocity_score = min(1.0, m["wrist_velocity"] / (velocity_threshold * 2))
+
+        # Arm extension score
+        angle_score = min(1.0, (m["elbow_angle"] - contact_angle_min) / 30.0)
+
+        best_contact = {
+            "sequencing_quality": sequencing_quality,
+            "ratio_score": ratio_score,
+            "velocity_score": velocity_score,
+            "angle_score": angle_score,
+            "shoulder_velocity_at_contact": m["shoulder_velocity"],
+            "elbow_velocity_at_contact": m["elbow_velocity"],
+        }
 
-            # Check wrist at peak velocity (distal end - fastest)
-            wrist_peak_velocity = m["wrist_velocity"] > velocity_threshold
+        # Calculate overall confidence
+        confidence = (
+            best_contact["sequencing_quality"] +
+            best_contact["ratio_score"] +
+            best_contact["velocity_score"] +
+            best_contact["angle_score"]
+        ) / 4.0
 
-            # Check velocity sequencing: wrist should be fastest (most important)
-            # This is the key kinematic chain principle: distal segment (wrist) moves faster than proximal (elbow)
-            wrist_fastest = m["wrist_velocity"] > m["elbow_velocity"]
+        return best_idx, confidence, best_contact
 
-            # Arm should be extended at contact
-            arm_extended = m["elbow_angle"] > self.contact_angle_min
+    def _contact_phase_velocity_peak(
+        self, metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+    ):
+        """
+        Detect contact at the wrist velocity peak after forward swing start.
 
-            # Wrist should be in front of body
-            wrist_in_front = not m["wrist_behind_body"]
+        Args:
+            metrics: Structured array of frame metrics (FRAME_METRIC_DTYPE)
+            forward_idx: Index of forward swing start
+            search_window_end: End (exclusive) of the contact search window
+            window_velocity: float64 wrist velocity over metrics[forward_idx:search_window_end]
+            velocity_threshold: Velocity threshold for detection
+
+        Returns:
+            dict: Contact phase entry (detected/confidence/reason/method and metrics,
+            plus the internal "_index" into metrics when detected)
+        """
+        cfg = self.config
+
+        # Traditional mode: Find frames with good arm extension that are moving fast
+        contact_candidates, any_fast, any_extended = self._scan_velocity_peak_window(
+            metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+        )
+
+        if contact_candidates.size:
+            # Contact is at MAXIMUM velocity (peak of swing)
+            contact_idx = _argmax_wrist_velocity(metrics, contact_candidates)
+
+            # Adjust forward by configured offset (contact happens slightly after peak velocity)
+            adjusted_idx = min(
+                len(metrics) - 1, contact_idx + cfg.contact_frame_offset
+            )
+            adjusted_contact = _metric_row(metrics, adjusted_idx)
+
+            # Calculate confidence based on velocity and arm extension
+            velocity_score = min(1.0, adjusted_contact["wrist_velocity"] / (velocity_threshold * 2))
+            angle_score = min(1.0, (adjusted_contact["elbow_angle"] - cfg.contact_angle_min) / 30.0)
+            confidence = (velocity_score + angle_score) / 2.0
 
-            if elbow_high_velocity and wrist_peak_velocity and wrist_fastest and arm_extended and wrist_in_front:
-                # Calculate sequencing quality score based on velocity gradient
-                # Higher gradient (wrist much faster than elbow) = better kinematic chain
-                velocity_gradient = m["wrist_velocity"] - m["elbow_velocity"]
-                sequencing_quality = min(1.0, velocity_gradient / 0.5)  # Full score at 0.5 difference
+            return _make_contact_phase(
+                adjusted_contact, adjusted_idx, "velocity_peak", confidence,
+                velocity_score=velocity_score,
+                angle_score=angle_score,
+            )
+        else:
+            # Determine specific failure reason (tracked during the scan)
+            no_velocity = not any_fast
+            no_extension = not any_extended
+
+            if no_velocity and no_extension:
+                reason = "insufficient_velocity_and_arm_not_extended"
+            elif no_velocity:
+                reason = "insufficient_velocity"
+            elif no_extension:
+                reason = "arm_not_extended"
+            else:
+                reason = "wrist_position_unclear"
+
+            return {
+                "detected": False,
+                "confidence": 0.0,
+                "reason": reason,
+                "method": "velocity_peak"
+            }
+
+    def _contact_phase_kinematic_chain(
+        self, metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+    ):
+        """
+        Detect contact from shoulder→elbow→wrist velocity sequencing.
 
-                # Velocity ratios (how well does it follow shoulder < elbow < wrist)
-                elbow_wrist_ratio = m["elbow_velocity"] / m["wrist_velocity"] if m["wrist_velocity"] > 0 else 0
-                shoulder_elbow_ratio = m["shoulder_velocity"] / m["elbow_velocity"] if m["elbow_velocity"] > 0 else 0
+        Args:
+            metrics: Structured array of frame metrics (FRAME_METRIC_DTYPE)
+            forward_idx: Index of forward swing start
+            search_window_end: End (exclusive) of the contact search window
+            window_velocity: float64 wrist velocity over metrics[forward_idx:search_window_end]
+            velocity_threshold: Velocity threshold for detection
 
-                # Ideal ratios: shoulder ~ 0.5-0.7 * elbow, elbow ~ 0.6-0.8 * wrist
-                ratio_score = (
-                    (1.0 - abs(shoulder_elbow_ratio - 0.6)) +  # Penalize deviation from 0.6
-                    (1.0 - abs(elbow_wrist_ratio - 0.7))      # Penalize deviation from 0.7
-                ) / 2.0
-                ratio_score = max(0.0, min(1.0, ratio_score))
+        Returns:
+            dict: Contact phase entry (detected/confidence/reason/method and metrics,
+            plus the internal "_index" into metrics when detected)
+        """
+        cfg = self.config
 
-                # Velocity score
-                velocity_score = min(1.0, m["wrist_velocity"] / (velocity_threshold * 2))
+        # Use new kinematic chain method (shoulder→elbow→wrist sequencing)
+        contact_idx, confidence, contact_result = self._detect_contact_kinematic_chain(
+            metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+        )
 
-                # Arm extension score
-                angle_score = min(1.0, (m["elbow_angle"] - self.contact_angle_min) / 30.0)
+        if contact_idx is not None:
 
-                # Store scores in metric for evaluation
-                m["sequencing_quality"] = sequencing_quality
-                m["ratio_score"] = ratio_score
-                m["velocity_score"] = velocity_score
-                m["angle_score"] = angle_score
-                m["shoulder_velocity_at_contact"] = m["shoulder_velocity"]
-                m["elbow_velocity_at_contact"] = m["elbow_velocity"]
+            # Adjust forward by configured offset
+            adjusted_idx = min(
+                len(metrics) - 1, contact_idx + cfg.contact_frame_offset
+            )
+            adjusted_contact = _metric_row(metrics, adjusted_idx)
+
+            return _make_contact_phase(
+                adjusted_contact, adjusted_idx, "kinematic_chain", confidence,
+                shoulder_velocity=contact_result["shoulder_velocity_at_contact"],
+                elbow_velocity=contact_result["elbow_velocity_at_contact"],
+                sequencing_quality=contact_result["sequencing_quality"],
+                ratio_score=contact_result["ratio_score"],
+                velocity_score=contact_result["velocity_score"],
+                angle_score=contact_result["angle_score"],
+            )
+        else:
+            return {
+                "detected": False,
+                "confidence": 0.0,
+                "reason": "no_kinematic_chain_signature_found",
+                "method": "kinematic_chain"
+            }
 
-                contact_candidates.append(m)
+    def _contact_phase_hybrid(
+        self, metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+    ):
+        """
+        Run kinematic chain and velocity peak detection, keep the more confident.
 
-        if not contact_candidates:
-            return None, 0.0
+        Args:
+            metrics: Structured array of frame metrics (FRAME_METRIC_DTYPE)
+            forward_idx: Index of forward swing start
+            search_window_end: End (exclusive) of the contact search window
+            window_velocity: float64 wrist velocity over metrics[forward_idx:search_window_end]
+            velocity_threshold: Velocity threshold for detection
 
-        # Choose best candidate based on wrist velocity (contact occurs at peak)
-        best_contact = max(contact_candidates, key=lambda x: x["wrist_velocity"])
+        Returns:
+            dict: Contact phase entry (detected/confidence/reason/method and metrics,
+            plus the internal "_index" into metrics when detected)
+        """
+        cfg = self.config
 
-        # Calculate overall confidence
-        confidence = (
-            best_contact["sequencing_quality"] +
-            best_contact["ratio_score"] +
-            best_contact["velocity_score"] +
-            best_contact["angle_score"]
-        ) / 4.0
+        # Try both methods and use best confidence
+        kc_idx, kc_confidence, kc_result = self._detect_contact_kinematic_chain(
+            metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+        )
 
-        return best_contact, confidence
+        # Also try velocity peak method over the same window
+        vp_candidates, _, _ = self._scan_velocity_peak_window(
+            metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+        )
+
+        vp_idx = None
+        vp_confidence = 0.0
+        if vp_candidates.size:
+            vp_idx = _argmax_wrist_velocity(metrics, vp_candidates)
+            vp_contact = _metric_row(metrics, vp_idx)
+            velocity_score = min(1.0, vp_contact["wrist_velocity"] / (velocity_threshold * 2))
+            angle_score = min(1.0, (vp_contact["elbow_angle"] - cfg.contact_angle_min) / 30.0)
+            vp_confidence = (velocity_score + angle_score) / 2.0
+
+        # Choose method with higher confidence
+        if kc_confidence >= vp_confidence and kc_idx is not None:
+            # Use kinematic chain result
+            adjusted_idx = min(
+                len(metrics) - 1, kc_idx + cfg.contact_frame_offset
+            )
+            adjusted_contact = _metric_row(metrics, adjusted_idx)
+
+            return _make_contact_phase(
+                adjusted_contact, adjusted_idx, "hybrid (used kinematic_chain)", kc_confidence,
+                shoulder_velocity=kc_result["shoulder_velocity_at_contact"],
+                elbow_velocity=kc_result["elbow_velocity_at_contact"],
+                sequencing_quality=kc_result["sequencing_quality"],
+            )
+        elif vp_idx is not None:
+            # Use velocity peak result
+            adjusted_idx = min(
+                len(metrics) - 1, vp_idx + cfg.contact_frame_offset
+            )
+            adjusted_contact = _metric_row(metrics, adjusted_idx)
+
+            velocity_score = min(1.0, adjusted_contact["wrist_velocity"] / (velocity_threshold * 2))
+            angle_score = min(1.0, (adjusted_contact["elbow_angle"] - cfg.contact_angle_min) / 30.0)
+
+            return _make_contact_phase(
+                adjusted_contact, adjusted_idx, "hybrid (used velocity_peak)",
+                (velocity_score + angle_score) / 2.0,
+                velocity_score=velocity_score,
+                angle_score=angle_score,
+            )
+        else:
+            return {
+                "detected": False,
+                "confidence": 0.0,
+                "reason": "no_contact_detected_by_any_method",
+                "method": "hybrid"
+            }
+
+    def _scan_velocity_peak_window(self, metrics, start, end, window_velocity, velocity_threshold):
+        """
+        Masks over metrics[start:end] for velocity peak contact detection.
+
+        window_velocity is the float64 wrist velocity over the same slice.
+
+        Returns:
+            tuple: (candidate_indices array, any_fast, any_extended) where candidates
+            are fast, extended frames with the wrist in front of the body, and
+            the flags record whether any frame met the velocity or the extension
+            criterion on its own (used to explain a failed detection)
+        """
+        window = metrics[start:end]
+        fast = window_velocity > velocity_threshold
+        extended = window["elbow_angle"] > self.config.contact_angle_min
+        candidates = fast & extended & ~window["wrist_behind_body"]
+
+        candidate_indices = start + np.flatnonzero(candidates)
+        any_fast = bool(fast.any())
+        any_extended = bool(extended.any())
+
+        return candidate_indices, any_fast, any_extended
 
     def _detect_phases(self, metrics, frames, velocity_threshold, kinematic_chain_mode=False):
         """
         Detect the swing phases based on calculated metrics.
 
         Args:
-            metrics: List of frame metrics with angles and velocities
+            metrics: Structured array of frame metrics (FRAME_METRIC_DTYPE) with angles and velocities
             frames: List of valid frames with pose data
             velocity_threshold: Threshold for velocity-based detection
             kinematic_chain_mode: If True, use multi-joint kinematic chain criteria
@@ -447,14 +721,81 @@ class SwingAnalyzer:
         - reason: explanation of success or failure
         - frame/timestamp/other metrics if detected
         """
+        cfg = self.config
+
+        # Frames where the wrist is behind the body, computed once and shared
+        # by the backswing start and max backswing searches
+        behind_mask = metrics["wrist_behind_body"]
+        behind_idx = np.flatnonzero(behind_mask)
 
-        # Initialize phase results with default failure state
+        # Compared against Python float thresholds in double precision, as the
+        # per-frame values were before metrics were stored as float32
+        wrist_velocities = metrics["wrist_velocity"].astype(np.float64)
+
+        # Find backswing start
+        backswing_start = None
+
+        if kinematic_chain_mode:
+            # Kinematic chain mode: Look for hip and shoulder rotation indicating backswing
+            # Combined rotation (both hips and shoulders rotating back), at least
+            # 10 degrees for the hips and 15 for the shoulders, with the wrist behind
+            # the body. Positive rotation indicates right side moving back (for
+            # right-handed player)
+            backswing_mask = (
+                (np.abs(metrics["hip_rotation"]) > 10)
+                & (np.abs(metrics["shoulder_rotation"]) > 15)
+                & behind_mask
+            )
+
+            if backswing_mask.any():
+                m = _metric_row(metrics, int(np.argmax(backswing_mask)))
+                # Calculate confidence based on rotation magnitude and wrist position
+                wrist_offset = m["body_center_x"] - m["wrist_x"]
+                rotation_score = min(1.0, (abs(m["hip_rotation"]) + abs(m["shoulder_rotation"])) / 50)
+                wrist_score = min(1.0, wrist_offset / 0.1)
+                confidence = (rotation_score + wrist_score) / 2.0
+
+                backswing_start = {
+                    "detected": True,
+                    "confidence": confidence,
+                    "reason": "Successfully detected (kinematic chain)",
+                    "frame": m["frame_number"],
+                    "timestamp": m["timestamp"],
+                    "wrist_offset": wrist_offset,
+                    "hip_rotation": m["hip_rotation"],
+                    "shoulder_rotation": m["shoulder_rotation"],
+                    "rotation_score": rotation_score
+                }
+            else:
+                backswing_failure = "insufficient_body_rotation"
+        else:
+            # Traditional mode: wrist goes behind body
+            if behind_idx.size:
+                m = _metric_row(metrics, behind_idx[0])
+                # Calculate confidence based on how far behind body
+                wrist_offset = m["body_center_x"] - m["wrist_x"]
+                confidence = min(1.0, wrist_offset / 0.1)  # Full confidence at 0.1 offset
+
+                backswing_start = {
+                    "detected": True,
+                    "confidence": confidence,
+                    "reason": "Successfully detected",
+                    "frame": m["frame_number"],
+                    "timestamp": m["timestamp"],
+                    "wrist_offset": wrist_offset
+                }
+            else:
+                backswing_failure = "wrist_never_behind_body"
+
+        if backswing_start is None:
+            # Every later phase searches from the one before it, so the whole
+            # chain fails the same way; copy the precomputed result
+            template = _NO_BACKSWING_PHASES[(backswing_failure, cfg.contact_detection_method)]
+            return {name: dict(entry) for name, entry in template.items()}
+
+        # Initialize the remaining phase results with default failure state
         phases = {
-            "backswing_start": {
-                "detected": False,
-                "confidence": 0.0,
-                "reason": "Not yet analyzed"
-            },
+            "backswing_start": backswing_start,
             "max_backswing": {
                 "detected": False,
                 "confidence": 0.0,
@@ -477,398 +818,151 @@ class SwingAnalyzer:
             },
         }
 
-        # Find backswing start
-        backswing_found = False
-
-        if kinematic_chain_mode:
-            # Kinematic chain mode: Look for hip and shoulder rotation indicating backswing
-            for i, m in enumerate(metrics):
-                # Check for combined rotation (both hips and shoulders rotating back)
-                # Positive rotation indicates right side moving back (for right-handed player)
-                hip_rotating = abs(m["hip_rotation"]) > 10  # At least 10 degrees rotation
-                shoulder_rotating = abs(m["shoulder_rotation"]) > 15  # At least 15 degrees rotation
-
-                if hip_rotating and shoulder_rotating and m["wrist_behind_body"]:
-                    # Calculate confidence based on rotation magnitude and wrist position
-                    wrist_offset = m["body_center_x"] - m["wrist_x"]
-                    rotation_score = min(1.0, (abs(m["hip_rotation"]) + abs(m["shoulder_rotation"])) / 50)
-                    wrist_score = min(1.0, wrist_offset / 0.1)
-                    confidence = (rotation_score + wrist_score) / 2.0
-
-                    phases["backswing_start"] = {
-                        "detected": True,
-                        "confidence": confidence,
-                        "reason": "Successfully detected (kinematic chain)",
-                        "frame": m["frame_number"],
-                        "timestamp": m["timestamp"],
-                        "wrist_offset": wrist_offset,
-                        "hip_rotation": m["hip_rotation"],
-                        "shoulder_rotation": m["shoulder_rotation"],
-                        "rotation_score": rotation_score
-                    }
-                    backswing_found = True
-                    break
-
-            if not backswing_found:
-                phases["backswing_start"]["reason"] = "insufficient_body_rotation"
-        else:
-            # Traditional mode: wrist goes behind body
-            for i, m in enumerate(metrics):
-                if m["wrist_behind_body"]:
-                    # Calculate confidence based on how far behind body
-                    wrist_offset = m["body_center_x"] - m["wrist_x"]
-                    confidence = min(1.0, wrist_offset / 0.1)  # Full confidence at 0.1 offset
-
-                    phases["backswing_start"] = {
-                        "detected": True,
-                        "confidence": confidence,
-                        "reason": "Successfully detected",
-                        "frame": m["frame_number"],
-                        "timestamp": m["timestamp"],
-                        "wrist_offset": wrist_offset
-                    }
-                    backswing_found = True
-                    break
-
-            if not backswing_found:
-                phases["backswing_start"]["reason"] = "wrist_never_behind_body"
-
         # Find max backswing (furthest back wrist position)
-        if phases["backswing_start"]["detected"]:
-            backswing_frames = [m for m in metrics if m["wrist_behind_body"]]
-            if backswing_frames:
-                max_back = min(backswing_frames, key=lambda x: x["wrist_x"])
-
-                # Calculate confidence based on backswing depth
-                backswing_depth = max_back["body_center_x"] - max_back["wrist_x"]
-                confidence = min(1.0, backswing_depth / 0.15)  # Full confidence at 0.15 depth
-
-                phases["max_backswing"] = {
-                    "detected": True,
-                    "confidence": confidence,
-                    "reason": "Successfully detected",
-                    "frame": max_back["frame_number"],
-                    "timestamp": max_back["timestamp"],
-                    "wrist_x": max_back["wrist_x"],
-                    "backswing_depth": backswing_depth
-                }
-            else:
-                phases["max_backswing"]["reason"] = "no_backswing_frames_found"
+        if behind_idx.size:
+            # Frames in front of the body can never be the furthest back
+            wrist_x = np.where(behind_mask, metrics["wrist_x"], np.inf)
+            max_back_idx = int(np.argmin(wrist_x))
+            max_back = _metric_row(metrics, max_back_idx)
+
+            # Calculate confidence based on backswing depth
+            backswing_depth = max_back["body_center_x"] - max_back["wrist_x"]
+            confidence = min(1.0, backswing_depth / 0.15)  # Full confidence at 0.15 depth
+
+            phases["max_backswing"] = {
+                "detected": True,
+                "confidence": confidence,
+                "reason": "Successfully detected",
+                "frame": max_back["frame_number"],
+                "timestamp": max_back["timestamp"],
+                "wrist_x": max_back["wrist_x"],
+                "backswing_depth": backswing_depth,
+                "_index": max_back_idx
+            }
         else:
-            phases["max_backswing"]["reason"] = "backswing_start_not_detected"
+            phases["max_backswing"]["reason"] = "no_backswing_frames_found"
 
         # Find forward swing start
         if phases["max_backswing"]["detected"]:
-            max_back_idx = next(
-                i
-                for i, m in enumerate(metrics)
-                if m["frame_number"] == phases["max_backswing"]["frame"]
-            )
-
-            forward_found = False
+            # Later phases resume the search from the index of the previous one
+            max_back_idx = phases["max_backswing"]["_index"]
+            wrist_velocity = wrist_velocities[max_back_idx:]
 
             if kinematic_chain_mode:
                 # Kinematic chain mode: Look for hip velocity reversal (proximal initiation)
                 # The forward swing should start with hips accelerating forward
-                for i in range(max_back_idx, len(metrics)):
-                    m = metrics[i]
-                    # Hip velocity reversal indicates forward swing initiation
-                    if m["hip_velocity"] > 30 and m["wrist_velocity"] > velocity_threshold * 0.5:
-                        # Calculate confidence based on hip velocity and wrist velocity
-                        hip_vel_score = min(1.0, m["hip_velocity"] / 60)
-                        wrist_vel_score = min(1.0, m["wrist_velocity"] / velocity_threshold)
-                        confidence = (hip_vel_score + wrist_vel_score) / 2.0
-
-                        phases["forward_swing_start"] = {
-                            "detected": True,
-                            "confidence": confidence,
-                            "reason": "Successfully detected (kinematic chain)",
-                            "frame": m["frame_number"],
-                            "timestamp": m["timestamp"],
-                            "velocity": m["wrist_velocity"],
-                            "hip_velocity": m["hip_velocity"],
-                            "shoulder_velocity": m["shoulder_velocity"],
-                            "hip_vel_score": hip_vel_score
-                        }
-                        forward_found = True
-                        break
-
-                if not forward_found:
-                    phases["forward_swing_start"]["reason"] = "no_hip_velocity_reversal"
-            else:
-                # Traditional mode: velocity increases after max backswing
-                for i in range(max_back_idx, len(metrics)):
-                    if metrics[i]["wrist_velocity"] > velocity_threshold:
-                        # Calculate confidence based on velocity relative to threshold
-                        velocity_ratio = metrics[i]["wrist_velocity"] / velocity_threshold
-                        confidence = min(1.0, (velocity_ratio - 1.0) / 2.0 + 0.5)  # 0.5-1.0 range
-
-                        phases["forward_swing_start"] = {
-                            "detected": True,
-                            "confidence": confidence,
-                            "reason": "Successfully detected",
-                            "frame": metrics[i]["frame_number"],
-                            "timestamp": metrics[i]["timestamp"],
-                            "velocity": metrics[i]["wrist_velocity"],
-                            "velocity_ratio": velocity_ratio
-                        }
-                        forward_found = True
-                        break
-
-                if not forward_found:
-                    phases["forward_swing_start"]["reason"] = "insufficient_velocity"
-        else:
-            phases["forward_swing_start"]["reason"] = "max_backswing_not_detected"
-
-        # Find contact point
-        if phases["forward_swing_start"]["detected"]:
-            forward_idx = next(
-                i
-                for i, m in enumerate(metrics)
-                if m["frame_number"] == phases["forward_swing_start"]["frame"]
-            )
-
-            # Determine which contact detection method to use
-            detection_method = self.contact_detection_method
-
-            # Use contact detection method
-            if detection_method == 'kinematic_chain':
-                # Use new kinematic chain method (shoulder→elbow→wrist sequencing)
-                contact_result, confidence = self._detect_contact_kinematic_chain(
-                    metrics, forward_idx, velocity_threshold
+                forward_mask = (metrics["hip_velocity"][max_back_idx:] > 30) & (
+                    wrist_velocity > velocity_threshold * 0.5
                 )
 
-                if contact_result:
-                    # Adjust forward by configured offset
-                    contact_idx = next(
-                        i
-                        for i, m in enumerate(metrics)
-                        if m["frame_number"] == contact_result["frame_number"]
-                    )
-                    adjusted_idx = min(
-                        len(metrics) - 1, contact_idx + self.contact_frame_offset
-                    )
-                    adjusted_contact = metrics[adjusted_idx]
-
-                    phases["contact"] = {
+                if forward_mask.any():
+                    forward_idx = max_back_idx + int(np.argmax(forward_mask))
+                    m = _metric_row(metrics, forward_idx)
+                    # Calculate confidence based on hip velocity and wrist velocity
+                    hip_vel_score = min(1.0, m["hip_velocity"] / 60)
+                    wrist_vel_score = min(1.0, m["wrist_velocity"] / velocity_threshold)
+                    confidence = (hip_vel_score + wrist_vel_score) / 2.0
+
+                    phases["forward_swing_start"] = {
                         "detected": True,
                         "confidence": confidence,
-                        "reason": "Successfully detected",
-                        "method": "kinematic_chain",
-                        "frame": adjusted_contact["frame_number"],
-                        "timestamp": adjusted_contact["timestamp"],
-                        "velocity": adjusted_contact["wrist_velocity"],
-                        "elbow_angle": adjusted_contact["elbow_angle"],
-                        "shoulder_velocity": contact_result.get("shoulder_velocity_at_contact", 0),
-                        "elbow_velocity": contact_result.get("elbow_velocity_at_contact", 0),
-                        "sequencing_quality": contact_result.get("sequencing_quality", 0),
-                        "ratio_score": contact_result.get("ratio_score", 0),
-                        "velocity_score": contact_result.get("velocity_score", 0),
-                        "angle_score": contact_result.get("angle_score", 0)
+                        "reason": "Successfully detected (kinematic chain)",
+                        "frame": m["frame_number"],
+                        "timestamp": m["timestamp"],
+                        "velocity": m["wrist_velocity"],
+                        "hip_velocity": m["hip_velocity"],
+                        "shoulder_velocity": m["shoulder_velocity"],
+                        "hip_vel_score": hip_vel_score,
+                        "_index": forward_idx
                     }
                 else:
-                    phases["contact"]["reason"] = "no_kinematic_chain_signature_found"
-                    phases["contact"]["method"] = "kinematic_chain"
+                    phases["forward_swing_start"]["reason"] = "no_hip_velocity_reversal"
+            else:
+                # Traditional mode: velocity increases after max backswing
+                forward_mask = wrist_velocity > velocity_threshold
 
-            elif detection_method == 'hybrid':
-                # Try both methods and use best confidence
-                kc_result, kc_confidence = self._detect_contact_kinematic_chain(
-                    metrics, forward_idx, velocity_threshold
-                )
+                if forward_mask.any():
+                    forward_idx = max_back_idx + int(np.argmax(forward_mask))
+                    m = _metric_row(metrics, forward_idx)
+                    # Calculate confidence based on velocity relative to threshold
+                    velocity_ratio = m["wrist_velocity"] / velocity_threshold
+                    confidence = min(1.0, (velocity_ratio - 1.0) / 2.0 + 0.5)  # 0.5-1.0 range
 
-                # Also try velocity peak method
-                search_window_end = min(
-                    forward_idx + self.forward_swing_search_window, len(metrics)
-                )
-                vp_candidates = []
-                for i in range(forward_idx, search_window_end):
-                    m = metrics[i]
-                    if (
-                        m["elbow_angle"] > self.contact_angle_min
-                        and m["wrist_velocity"] > velocity_threshold
-                        and not m["wrist_behind_body"]
-                    ):
-                        vp_candidates.append(m)
-
-                vp_result = None
-                vp_confidence = 0.0
-                if vp_candidates:
-                    vp_contact = max(vp_candidates, key=lambda x: x["wrist_velocity"])
-                    velocity_score = min(1.0, vp_contact["wrist_velocity"] / (velocity_threshold * 2))
-                    angle_score = min(1.0, (vp_contact["elbow_angle"] - self.contact_angle_min) / 30.0)
-                    vp_confidence = (velocity_score + angle_score) / 2.0
-                    vp_result = vp_contact
-
-                # Choose method with higher confidence
-                if kc_confidence >= vp_confidence and kc_result:
-                    # Use kinematic chain result
-                    contact_idx = next(
-                        i
-                        for i, m in enumerate(metrics)
-                        if m["frame_number"] == kc_result["frame_number"]
-                    )
-                    adjusted_idx = min(
-                        len(metrics) - 1, contact_idx + self.contact_frame_offset
-                    )
-                    adjusted_contact = metrics[adjusted_idx]
-
-                    phases["contact"] = {
+                    phases["forward_swing_start"] = {
                         "detected": True,
-                        "confidence": kc_confidence,
-                        "reason": "Successfully detected",
-                        "method": "hybrid (used kinematic_chain)",
-                        "frame": adjusted_contact["frame_number"],
-                        "timestamp": adjusted_contact["timestamp"],
-                        "velocity": adjusted_contact["wrist_velocity"],
-                        "elbow_angle": adjusted_contact["elbow_angle"],
-                        "shoulder_velocity": kc_result.get("shoulder_velocity_at_contact", 0),
-                        "elbow_velocity": kc_result.get("elbow_velocity_at_contact", 0),
-                        "sequencing_quality": kc_result.get("sequencing_quality", 0)
-                    }
-                elif vp_result:
-                    # Use velocity peak result
-                    contact_idx = next(
-                        i
-                        for i, m in enumerate(metrics)
-                        if m["frame_number"] == vp_result["frame_number"]
-                    )
-                    adjusted_idx = min(
-                        len(metrics) - 1, contact_idx + self.contact_frame_offset
-                    )
-                    adjusted_contact = metrics[adjusted_idx]
-
-                    velocity_score = min(1.0, adjusted_contact["wrist_velocity"] / (velocity_threshold * 2))
-                    angle_score = min(1.0, (adjusted_contact["elbow_angle"] - self.contact_angle_min) / 30.0)
-
-                    phases["contact"] = {
-                        "detected": True,
-                        "confidence": (velocity_score + angle_score) / 2.0,
+                        "confidence": confidence,
                         "reason": "Successfully detected",
-                        "method": "hybrid (used velocity_peak)",
-                        "frame": adjusted_contact["frame_number"],
-                        "timestamp": adjusted_contact["timestamp"],
-                        "velocity": adjusted_contact["wrist_velocity"],
-                        "elbow_angle": adjusted_contact["elbow_angle"],
-                        "velocity_score": velocity_score,
-                        "angle_score": angle_score
+                        "frame": m["frame_number"],
+                        "timestamp": m["timestamp"],
+                        "velocity": m["wrist_velocity"],
+                        "velocity_ratio": velocity_ratio,
+                        "_index": forward_idx
                     }
                 else:
-                    phases["contact"]["reason"] = "no_contact_detected_by_any_method"
-                    phases["contact"]["method"] = "hybrid"
+                    phases["forward_swing_start"]["reason"] = "insufficient_velocity"
+        else:
+            phases["forward_swing_start"]["reason"] = "max_backswing_not_detected"
 
-            else:  # velocity_peak (default)
-                # Look ahead from forward swing start with configurable search window
-                search_window_end = min(
-                    forward_idx + self.forward_swing_search_window, len(metrics)
-                )
+        # Find contact point
+        if phases["forward_swing_start"]["detected"]:
+            forward_idx = phases["forward_swing_start"]["_index"]
 
-                contact_candidates = []
-
-                # Traditional mode: Find frames with good arm extension that are moving fast
-                for i in range(forward_idx, search_window_end):
-                    m = metrics[i]
-                    if (
-                        m["elbow_angle"] > self.contact_angle_min
-                        and m["wrist_velocity"] > velocity_threshold
-                        and not m["wrist_behind_body"]
-                    ):
-                        contact_candidates.append(m)
-
-                if contact_candidates:
-                    # Contact is at MAXIMUM velocity (peak of swing)
-                    contact = max(contact_candidates, key=lambda x: x["wrist_velocity"])
-
-                    # Adjust forward by configured offset (contact happens slightly after peak velocity)
-                    contact_idx = next(
-                        i
-                        for i, m in enumerate(metrics)
-                        if m["frame_number"] == contact["frame_number"]
-                    )
-                    adjusted_idx = min(
-                        len(metrics) - 1, contact_idx + self.contact_frame_offset
-                    )
-                    adjusted_contact = metrics[adjusted_idx]
-
-                    # Calculate confidence based on velocity and arm extension
-                    velocity_score = min(1.0, adjusted_contact["wrist_velocity"] / (velocity_threshold * 2))
-                    angle_score = min(1.0, (adjusted_contact["elbow_angle"] - self.contact_angle_min) / 30.0)
-                    confidence = (velocity_score + angle_score) / 2.0
-
-                    phases["contact"] = {
-                        "detected": True,
-                        "confidence": confidence,
-                        "reason": "Successfully detected",
-                        "method": "velocity_peak",
-                        "frame": adjusted_contact["frame_number"],
-                        "timestamp": adjusted_contact["timestamp"],
-                        "velocity": adjusted_contact["wrist_velocity"],
-                        "elbow_angle": adjusted_contact["elbow_angle"],
-                        "velocity_score": velocity_score,
-                        "angle_score": angle_score
-                    }
-                else:
-                    # Determine specific failure reason
-                    no_velocity = all(
-                        m["wrist_velocity"] <= velocity_threshold
-                        for m in metrics[forward_idx:search_window_end]
-                    )
-                    no_extension = all(
-                        m["elbow_angle"] <= self.contact_angle_min
-                        for m in metrics[forward_idx:search_window_end]
-                    )
-
-                    if no_velocity and no_extension:
-                        phases["contact"]["reason"] = "insufficient_velocity_and_arm_not_extended"
-                    elif no_velocity:
-                        phases["contact"]["reason"] = "insufficient_velocity"
-                    elif no_extension:
-                        phases["contact"]["reason"] = "arm_not_extended"
-                    else:
-                        phases["contact"]["reason"] = "wrist_position_unclear"
-                    phases["contact"]["method"] = "velocity_peak"
+            # Look ahead from forward swing start with configurable search window;
+            # the window is sliced once here and shared by the contact detectors
+            search_window_end = min(
+                forward_idx + cfg.forward_swing_search_window, len(metrics)
+            )
+            window_velocity = wrist_velocities[forward_idx:search_window_end]
 
+            # Method was resolved once from the config in __init__
+            phases["contact"] = self._contact_phase(
+                metrics, forward_idx, search_window_end, window_velocity, velocity_threshold
+            )
         else:
             phases["contact"]["reason"] = "forward_swing_start_not_detected"
-            phases["contact"]["method"] = self.contact_detection_method
+            phases["contact"]["method"] = cfg.contact_detection_method
 
         # Find follow through (wrist crosses far past body center)
         if phases["contact"]["detected"]:
-            contact_idx = next(
-                i
-                for i, m in enumerate(metrics)
-                if m["frame_number"] == phases["contact"]["frame"]
-            )
+            contact_idx = phases["contact"]["_index"]
 
-            follow_found = False
-            for i in range(contact_idx, len(metrics)):
-                m = metrics[i]
-                # Wrist significantly past body center on opposite side (using configured offset)
-                if m["wrist_x"] > m["body_center_x"] + self.follow_through_offset:
-                    # Calculate confidence based on how far past body center
-                    follow_distance = m["wrist_x"] - m["body_center_x"]
-                    confidence = min(1.0, follow_distance / 0.3)  # Full confidence at 0.3 distance
+            # Wrist significantly past body center on opposite side (using configured offset)
+            follow_idx = _first_crossing(
+                metrics["wrist_x"], metrics["body_center_x"], contact_idx, cfg.follow_through_offset
+            )
 
-                    phases["follow_through"] = {
-                        "detected": True,
-                        "confidence": confidence,
-                        "reason": "Successfully detected",
-                        "frame": m["frame_number"],
-                        "timestamp": m["timestamp"],
-                        "wrist_x": m["wrist_x"],
-                        "follow_distance": follow_distance
-                    }
-                    follow_found = True
-                    break
+            if follow_idx >= 0:
+                m = _metric_row(metrics, follow_idx)
+                # Calculate confidence based on how far past body center
+                follow_distance = m["wrist_x"] - m["body_center_x"]
+                confidence = min(1.0, follow_distance / 0.3)  # Full confidence at 0.3 distance
 
-            if not follow_found:
+                phases["follow_through"] = {
+                    "detected": True,
+                    "confidence": confidence,
+                    "reason": "Successfully detected",
+                    "frame": m["frame_number"],
+                    "timestamp": m["timestamp"],
+                    "wrist_x": m["wrist_x"],
+                    "follow_distance": follow_distance
+                }
+            else:
                 phases["follow_through"]["reason"] = "wrist_never_crossed_body_center"
         else:
             phases["follow_through"]["reason"] = "contact_not_detected"
 
+        # Indices into metrics are internal to detection
+        for phase in phases.values():
+            phase.pop("_index", None)
+
         # Calculate overall analysis quality score
-        detected_count = sum(1 for p in phases.values() if p["detected"])
+        detected_count = 0
+        total_confidence = 0.0
+        for phase in phases.values():
+            detected_count += phase["detected"]
+            total_confidence += phase["confidence"]
         total_phases = len(phases)
-        avg_confidence = sum(p["confidence"] for p in phases.values()) / total_phases
+        avg_confidence = total_confidence / total_phases
 
         phases["_analysis_quality"] = {
             "overall_score": avg_confidence,
@@ -889,71 +983,25 @@ class SwingAnalyzer:
         Args:
             results: SwingAnalysisResults object to populate
             phases_dict: Legacy dict with phase detection results
-            frame_metrics: List of frame metrics (for calculating engine/tempo/kinetic chain)
+            frame_metrics: Frame metrics array (for calculating engine/tempo/kinetic chain)
             fps: Video frames per second
         """
-        # Map old phase names to new phase names
-        phase_mapping = {
-            'backswing_start': 'unit_turn',
-            'max_backswing': 'backswing',
-            'forward_swing_start': 'forward_swing',
-            'contact': 'contact',
-            'follow_through': 'follow_through'
-        }
-
-        # Add all phases to results
-        for old_name, new_name in phase_mapping.items():
+        # Add all phases to results, mapping old phase names to new ones
+        for old_name, new_name, phase_metrics_of in _PHASE_TABLE:
             if old_name in phases_dict:
                 phase_data = phases_dict[old_name]
 
                 # Extract base fields
                 detected = phase_data.get('detected', False)
-                frame = phase_data.get('frame')
-                timestamp = phase_data.get('timestamp')
-                confidence = phase_data.get('confidence', 0.0)
-
-                # Add phase-specific metrics
-                phase_metrics = {}
-
-                if new_name == 'unit_turn' and detected:
-                    # Add shoulder rotation for unit turn
-                    phase_metrics['shoulder_rotation'] = phase_data.get('shoulder_rotation', 0.0)
-
-                elif new_name == 'backswing' and detected:
-                    # Add max wrist depth and shoulder rotation for backswing
-                    phase_metrics['shoulder_rotation'] = phase_data.get('shoulder_rotation', 0.0)
-                    # Calculate max wrist depth (normalized wrist-x position relative to body)
-                    if frame:
-                        metric = next((m for m in frame_metrics if m['frame_number'] == frame), None)
-                        if metric:
-                            # Max depth = how far back wrist is (lower x = more back)
-                            phase_metrics['max_wrist_depth'] = 1.0 - metric.get('wrist_x', 0.5)
-
-                elif new_name == 'forward_swing' and detected:
-                    # Add hip velocity for forward swing
-                    phase_metrics['hip_velocity'] = phase_data.get('hip_velocity', 0.0)
-
-                elif new_name == 'contact' and detected:
-                    # Add wrist velocity and elbow angle for contact
-                    phase_metrics['wrist_velocity'] = phase_data.get('velocity', 0.0)
-                    phase_metrics['elbow_angle'] = phase_data.get('elbow_angle', 0.0)
-                    phase_metrics['method'] = phase_data.get('method', 'unknown')
-                    # Add kinematic chain metrics if available
-                    if 'shoulder_velocity' in phase_data:
-                        phase_metrics['shoulder_velocity'] = phase_data['shoulder_velocity']
-                    if 'elbow_velocity' in phase_data:
-                        phase_metrics['elbow_velocity'] = phase_data['elbow_velocity']
-                    if 'sequencing_quality' in phase_data:
-                        phase_metrics['sequencing_quality'] = phase_data['sequencing_quality']
-
-                # Add the phase
+
+                # Add the phase, with phase-specific metrics when detected
                 results.add_phase(
                     new_name,
                     detected=detected,
-                    frame=frame,
-                    timestamp=timestamp,
-                    confidence=confidence,
-                    **phase_metrics
+                    frame=phase_data.get('frame'),
+                    timestamp=phase_data.get('timestamp'),
+                    confidence=phase_data.get('confidence', 0.0),
+                    **(phase_metrics_of(phase_data) if detected else {})
                 )
 
         # Calculate and add engine metrics
@@ -971,48 +1019,52 @@ class SwingAnalyzer:
 
         Args:
             results: SwingAnalysisResults object to populate
-            frame_metrics: List of frame metrics
+            frame_metrics: Structured array of frame metrics (FRAME_METRIC_DTYPE)
         """
-        if not frame_metrics:
+        if len(frame_metrics) == 0:
             return
 
+        frame_numbers = frame_metrics["frame_number"]
+        timestamps = frame_metrics["timestamp"]
+        hip_rot = frame_metrics["hip_rotation"].astype(np.float64)
+        shoulder_rot = frame_metrics["shoulder_rotation"].astype(np.float64)
+
+        # NaN frames are skipped, as in a comparison loop: they are masked to
+        # -inf for the argmax and +inf for the argmins, so they never win
+        separation = np.abs(shoulder_rot - hip_rot)
+        separation[np.isnan(separation)] = -np.inf
+        shoulder_rot[np.isnan(shoulder_rot)] = np.inf
+        hip_rot[np.isnan(hip_rot)] = np.inf
+
         # Find maximum hip-shoulder separation
         max_separation = 0.0
         max_sep_frame = None
         max_sep_timestamp = None
+        i = int(np.argmax(separation))
+        if separation[i] > max_separation:
+            max_separation = float(separation[i])
+            max_sep_frame = int(frame_numbers[i])
+            max_sep_timestamp = float(timestamps[i])
 
-        # Find maximum shoulder rotation (most backward)
+        # Find maximum shoulder rotation (most negative = most backward)
         max_shoulder_rot = 0.0
         max_shoulder_frame = None
         max_shoulder_timestamp = None
+        i = int(np.argmin(shoulder_rot))
+        if shoulder_rot[i] < max_shoulder_rot:
+            max_shoulder_rot = float(shoulder_rot[i])
+            max_shoulder_frame = int(frame_numbers[i])
+            max_shoulder_timestamp = float(timestamps[i])
 
-        # Find maximum hip rotation (most backward)
+        # Find maximum hip rotation (most negative = most backward)
         max_hip_rot = 0.0
         max_hip_frame = None
         max_hip_timestamp = None
-
-        for metric in frame_metrics:
-            hip_rot = metric.get('hip_rotation', 0.0)
-            shoulder_rot = metric.get('shoulder_rotation', 0.0)
-            separation = abs(shoulder_rot - hip_rot)
-
-            # Track max separation
-            if separation > max_separation:
-                max_separation = separation
-                max_sep_frame = metric['frame_number']
-                max_sep_timestamp = metric['timestamp']
-
-            # Track max shoulder rotation (most negative = most backward)
-            if shoulder_rot < max_shoulder_rot:
-                max_shoulder_rot = shoulder_rot
-                max_shoulder_frame = metric['frame_number']
-                max_shoulder_timestamp = metric['timestamp']
-
-            # Track max hip rotation (most negative = most backward)
-            if hip_rot < max_hip_rot:
-                max_hip_rot = hip_rot
-                max_hip_frame = metric['frame_number']
-                max_hip_timestamp = metric['timestamp']
+        i = int(np.argmin(hip_rot))
+        if hip_rot[i] < max_hip_rot:
+            max_hip_rot = float(hip_rot[i])
+            max_hip_frame = int(frame_numbers[i])
+            max_hip_timestamp = float(timestamps[i])
 
         # Add engine metrics
         results.add_engine_metrics(
@@ -1082,54 +1134,21 @@ class SwingAnalyzer:
 
         Args:
             results: SwingAnalysisResults object to populate
-            frame_metrics: List of frame metrics
+            frame_metrics: Structured array of frame metrics (FRAME_METRIC_DTYPE)
             phases_dict: Legacy dict with phase detection results
         """
-        if not frame_metrics:
+        if len(frame_metrics) == 0:
             return
 
         # Find peak velocities for each segment
-        max_hip_vel = 0.0
-        max_hip_frame = None
-        max_hip_ts = None
-
-        max_shoulder_vel = 0.0
-        max_shoulder_frame = None
-        max_shoulder_ts = None
-
-        max_elbow_vel = 0.0
-        max_elbow_frame = None
-        max_elbow_ts = None
-
-        max_wrist_vel = 0.0
-        max_wrist_frame = None
-        max_wrist_ts = None
-
-        for metric in frame_metrics:
-            hip_vel = metric.get('hip_velocity', 0.0)
-            shoulder_vel = metric.get('shoulder_velocity', 0.0)
-            elbow_vel = metric.get('elbow_velocity', 0.0)
-            wrist_vel = metric.get('wrist_velocity', 0.0)
-
-            if hip_vel > max_hip_vel:
-                max_hip_vel = hip_vel
-                max_hip_frame = metric['frame_number']
-                max_hip_ts = metric['timestamp']
-
-            if shoulder_vel > max_shoulder_vel:
-                max_shoulder_vel = shoulder_vel
-                max_shoulder_frame = metric['frame_number']
-                max_shoulder_ts = metric['timestamp']
-
-            if elbow_vel > max_elbow_vel:
-                max_elbow_vel = elbow_vel
-                max_elbow_frame = metric['frame_number']
-                max_elbow_ts = metric['timestamp']
-
-            if wrist_vel > max_wrist_vel:
-                max_wrist_vel = wrist_vel
-                max_wrist_frame = metric['frame_number']
-                max_wrist_ts = metric['timestamp']
+        (
+            (max_hip_vel, max_hip_frame, max_hip_ts),
+            (max_shoulder_vel, max_shoulder_frame, max_shoulder_ts),
+            (max_elbow_vel, max_elbow_frame, max_elbow_ts),
+            (max_wrist_vel, max_wrist_frame, max_wrist_ts),
+        ) = _column_peaks(
+            frame_metrics, ("hip_velocity", "shoulder_velocity", "elbow_velocity", "wrist_velocity")
+        )
 
         # Build sequence dict
         sequence = {
@@ -1152,23 +1171,14 @@ class SwingAnalyzer:
         # Proper sequence: hip peaks first, then shoulder, then elbow, then wrist
         confidence = 0.0
         if all([max_hip_ts, max_shoulder_ts, max_elbow_ts, max_wrist_ts]):
-            # Check if sequence is correct
-            correct_sequence = (
-                max_hip_ts <= max_shoulder_ts <= max_elbow_ts <= max_wrist_ts
+            # Credit for each correctly ordered pair of adjacent peaks; a fully
+            # correct sequence scores 3/3 = 1.0
+            correct_pairs = (
+                (max_hip_ts <= max_shoulder_ts)
+                + (max_shoulder_ts <= max_elbow_ts)
+                + (max_elbow_ts <= max_wrist_ts)
             )
-            if correct_sequence:
-                confidence = 1.0
-            else:
-                # Partial credit for partial correct ordering
-                correct_pairs = 0
-                total_pairs = 3
-                if max_hip_ts <= max_shoulder_ts:
-                    correct_pairs += 1
-                if max_shoulder_ts <= max_elbow_ts:
-                    correct_pairs += 1
-                if max_elbow_ts <= max_wrist_ts:
-                    correct_pairs += 1
-                confidence = correct_pairs / total_pairs
+            confidence = correct_pairs / 3
 
         # Add kinetic chain metrics
         results.add_kinetic_chain_metrics(
@@ -1178,6 +1188,258 @@ class SwingAnalyzer:
         )
 
 
+def _unit_turn_metrics(phase_data):
+    """Results metrics for a detected unit turn (backswing start)."""
+    return {'shoulder_rotation': phase_data.get('shoulder_rotation', 0.0)}
+
+
+def _backswing_metrics(phase_data):
+    """Results metrics for a detected max backswing."""
+    phase_metrics = {'shoulder_rotation': phase_data.get('shoulder_rotation', 0.0)}
+    # Calculate max wrist depth (normalized wrist-x position relative to body).
+    # The phase already carries the wrist position of its frame, so the
+    # frame metrics don't need to be searched for it
+    if phase_data.get('frame'):
+        # Max depth = how far back wrist is (lower x = more back)
+        phase_metrics['max_wrist_depth'] = 1.0 - phase_data.get('wrist_x', 0.5)
+    return phase_metrics
+
+
+def _forward_swing_metrics(phase_data):
+    """Results metrics for a detected forward swing start."""
+    return {'hip_velocity': phase_data.get('hip_velocity', 0.0)}
+
+
+def _contact_metrics(phase_data):
+    """Results metrics for a detected contact, including kinematic chain metrics if available."""
+    phase_metrics = {
+        'wrist_velocity': phase_data.get('velocity', 0.0),
+        'elbow_angle': phase_data.get('elbow_angle', 0.0),
+        'method': phase_data.get('method', 'unknown'),
+    }
+    for key in ('shoulder_velocity', 'elbow_velocity', 'sequencing_quality'):
+        if key in phase_data:
+            phase_metrics[key] = phase_data[key]
+    return phase_metrics
+
+
+def _follow_through_metrics(phase_data):
+    """Results metrics for a detected follow through (none beyond the base fields)."""
+    return {}
+
+
+# (phases dict name, SwingAnalysisResults phase name, phase metrics extractor)
+_PHASE_TABLE = (
+    ('backswing_start', 'unit_turn', _unit_turn_metrics),
+    ('max_backswing', 'backswing', _backswing_metrics),
+    ('forward_swing_start', 'forward_swing', _forward_swing_metrics),
+    ('contact', 'contact', _contact_metrics),
+    ('follow_through', 'follow_through', _follow_through_metrics),
+)
+
+
+def _landmark_tensor(frames):
+    """
+    Stack the landmarks of frames into one (N, K, 3) float32 array of [x, y, z].
+
+    Axis 1 follows LANDMARK_NAMES (see the _LS.._RH indices), the same layout
+    as video_data['landmarks_array'] without the visibility column. Missing
+    landmarks or coordinates are NaN.
+    """
+    try:
+        return np.array(
+            [list(map(_get_xyz, _get_tracked_landmarks(frame["landmarks"]))) for frame in frames],
+            dtype=np.float32,
+        ).reshape(len(frames), len(LANDMARK_NAMES), 3)
+    except KeyError:
+        # Hand-made frames can lack landmarks (e.g. hips) or z
+        return landmarks_to_array(
+            [frame["landmarks"] for frame in frames], LANDMARK_NAMES, dtype=np.float32
+        )
+
+
+def _landmarks_array(frames):
+    """
+    Build VideoProcessor's landmarks_array from frame dicts: (N, K, 4) float32
+    [x, y, z, visibility] in LANDMARK_NAMES order, NaN where no pose was
+    detected and for missing landmarks or fields.
+    """
+    missing = [(np.nan,) * 4] * len(LANDMARK_NAMES)
+    try:
+        return np.array(
+            [
+                list(map(_get_xyzv, _get_tracked_landmarks(frame["landmarks"])))
+                if frame["pose_detected"] else missing
+                for frame in frames
+            ],
+            dtype=np.float32,
+        ).reshape(len(frames), len(LANDMARK_NAMES), 4)
+    except KeyError:
+        # Hand-made frames can lack landmarks, z or visibility
+        return landmarks_to_array(
+            [frame["landmarks"] if frame["pose_detected"] else {} for frame in frames],
+            LANDMARK_NAMES,
+            dtype=np.float32,
+            fields=LANDMARK_FIELDS,
+        )
+
+
+def _compute_frame_metrics(metrics, landmarks, fps):
+    """
+    Fill the landmark-derived columns of metrics (all but frame_number,
+    timestamp and knee_bend) from an (N, K, 3) landmark tensor.
+
+    Pure array code with no frame dicts involved; frame-to-frame velocities
+    are finite differences with a leading 0 for the first frame. Everything
+    is computed in the tensor's dtype (float32 from _landmark_tensor), the
+    precision the metrics are stored in anyway.
+    """
+    left_shoulder = landmarks[:, _LS]
+    right_shoulder = landmarks[:, _RS]
+    right_elbow = landmarks[:, _RE]
+    right_wrist = landmarks[:, _RW]
+    left_hip = landmarks[:, _LH]
+    right_hip = landmarks[:, _RH]
+
+    # Elbow angle (shoulder-elbow-wrist), NaN for degenerate triangles
+    # like calculate_angle
+    ba = right_shoulder[:, :2] - right_elbow[:, :2]
+    bc = right_wrist[:, :2] - right_elbow[:, :2]
+    norm_product = np.hypot(ba[:, 0], ba[:, 1]) * np.hypot(bc[:, 0], bc[:, 1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine_angle = np.einsum("ij,ij->i", ba, bc) / norm_product
+    elbow_angle = np.degrees(np.arccos(np.clip(cosine_angle, -1.0, 1.0)))
+    elbow_angle[norm_product == 0] = np.nan
+
+    # Body center and wrist position relative to it
+    body_center = (left_shoulder[:, 0] + right_shoulder[:, 0]) / 2
+    wrist_x = right_wrist[:, 0]
+
+    # ===== KINEMATIC CHAIN METRICS =====
+    # Rotations in the x-z plane, as in kinematic_chain_utils. Like those
+    # functions, 0.0 where landmarks or z are missing (NaN in the tensor)
+    hip_rotation = np.degrees(
+        np.arctan2(right_hip[:, 2] - left_hip[:, 2], right_hip[:, 0] - left_hip[:, 0])
+    )
+    hip_rotation = np.where(np.isnan(hip_rotation), 0.0, hip_rotation)
+    shoulder_rotation = np.degrees(
+        np.arctan2(
+            right_shoulder[:, 2] - left_shoulder[:, 2],
+            right_shoulder[:, 0] - left_shoulder[:, 0],
+        )
+    )
+    shoulder_rotation = np.where(np.isnan(shoulder_rotation), 0.0, shoulder_rotation)
+    # Trunk vector from hip midpoint to shoulder midpoint; -dy because
+    # image y increases downward
+    trunk = (left_shoulder + right_shoulder) / 2 - (left_hip + right_hip) / 2
+    trunk_lean = np.degrees(np.arctan2(trunk[:, 2], -trunk[:, 1]))
+    trunk_lean = np.where(np.isnan(trunk_lean), 0.0, trunk_lean)
+
+    metrics["elbow_angle"] = elbow_angle
+    metrics["wrist_velocity"] = _step_velocity(right_wrist[:, :2], fps)
+    metrics["wrist_x"] = wrist_x
+    metrics["wrist_behind_body"] = wrist_x < body_center
+    metrics["body_center_x"] = body_center
+    metrics["hip_rotation"] = hip_rotation
+    metrics["shoulder_rotation"] = shoulder_rotation
+    metrics["trunk_lean"] = trunk_lean
+    # Angular velocity = change in angle / time
+    metrics["hip_velocity"] = _step_velocity(hip_rotation, fps)
+    metrics["shoulder_velocity"] = _step_velocity(shoulder_rotation, fps)
+    # Linear velocity for elbow (similar to wrist)
+    metrics["elbow_velocity"] = _step_velocity(right_elbow[:, :2], fps)
+
+
+def _step_velocity(positions, fps):
+    """
+    Frame-to-frame speed of (N,) angles or (N, 2) positions, 0 for the first frame.
+
+    Steps are one frame apart, so dividing by the frame time is a multiply by fps.
+    """
+    velocity = np.zeros(len(positions), dtype=positions.dtype)
+    steps = np.diff(positions, axis=0)
+    if steps.ndim == 1:
+        np.abs(steps, out=velocity[1:])
+    else:
+        np.hypot(steps[:, 0], steps[:, 1], out=velocity[1:])
+    velocity *= fps
+    return velocity
+
+
+def _make_contact_phase(contact, index, method, confidence, **extras):
+    """
+    Build a detected contact phase entry from the contact frame's metrics.
+
+    Args:
+        contact: Metric row (dict) of the contact frame
+        index: Index of the contact frame in metrics (kept as internal "_index")
+        method: Detection method reported in the entry
+        confidence: Detection confidence (0-1)
+        **extras: Method-specific fields appended after the common ones
+    """
+    phase = {
+        "detected": True,
+        "confidence": confidence,
+        "reason": "Successfully detected",
+        "method": method,
+        "frame": contact["frame_number"],
+        "timestamp": contact["timestamp"],
+        "velocity": contact["wrist_velocity"],
+        "elbow_angle": contact["elbow_angle"],
+    }
+    phase.update(extras)
+    phase["_index"] = index
+    return phase
+
+
+def _argmax_wrist_velocity(metrics, indices):
+    """Return the index (from indices) of the frame with the highest wrist velocity."""
+    return int(indices[np.argmax(metrics["wrist_velocity"][indices])])
+
+
+def _first_crossing(wrist_x, body_center_x, start, offset):
+    """
+    Return the first index from start where wrist_x > body_center_x + offset, or -1.
+
+    The offset is added in double precision, as with the per-frame values
+    before metrics were stored as float32.
+    """
+    crossed = wrist_x[start:] > body_center_x[start:].astype(np.float64) + offset
+    if not crossed.any():
+        return -1
+    return start + int(np.argmax(crossed))
+
+
+def _column_peaks(metrics, names):
+    """
+    Return (value, frame_number, timestamp) of the first maximum of each named
+    metric column, or (0.0, None, None) for a column where no frame exceeds 0.
+
+    The columns are reduced together with one argmax over an (N, len(names))
+    block rather than one pass per column.
+    """
+    columns = structured_to_unstructured(metrics[list(names)])
+    peak_idx = np.argmax(columns, axis=0)
+    peaks = columns[peak_idx, np.arange(len(names))]
+
+    frame_numbers = metrics["frame_number"][peak_idx].tolist()
+    timestamps = metrics["timestamp"][peak_idx].tolist()
+    return [
+        (value, frame, timestamp) if value > 0 else (0.0, None, None)
+        for value, frame, timestamp in zip(peaks.tolist(), frame_numbers, timestamps)
+    ]
+
+
+def _metric_row(metrics, i):
+    """Return frame i of a FRAME_METRIC_DTYPE array as a dict of Python scalars."""
+    return dict(zip(metrics.dtype.names, metrics[i].item()))
+
+
+def _analyze_in_worker(config, video_data):
+    """Process pool entry point for SwingAnalyzer.analyze_many."""
+    return SwingAnalyzer(config=config).analyze_swing(video_data)
+
+
 # Test the analyzer
 if __name__ == "__main__":
     from video_processor import VideoProcessor
@@ -11,23 +11,44 @@ Tests the complete tennis swing analysis pipeline:
 Tests with multiple videos of varying quality to ensure robustness.
 """
 
+import io
 import os
 import sys
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 
-from video_processor import VideoProcessor, PRESET_DIFFICULT_VIDEO
+from video_processor import PRESET_DIFFICULT_VIDEO, process_video_cached
 from swing_analyzer import SwingAnalyzer
 from analysis_results import SwingAnalysisResults
 from visualize_swing import visualize_swing_phases
 
-
-def validate_swing_results(results: SwingAnalysisResults, video_path: str) -> dict:
+# Fields checked by validate_swing_results. Missing ones are found with a
+# single set difference against the dict's keys
+_EXPECTED_PHASES = ('unit_turn', 'backswing', 'forward_swing', 'contact', 'follow_through')
+_REQUIRED_SECTIONS = frozenset({'phases', 'engine', 'tempo', 'kinetic_chain'})
+_PHASE_REQUIRED_FIELDS = frozenset({'detected', 'confidence'})
+_ENGINE_FIELDS = frozenset({'hip_shoulder_separation', 'max_shoulder_rotation', 'max_hip_rotation'})
+_TEMPO_FIELDS = frozenset({'backswing_duration', 'forward_swing_duration', 'swing_rhythm_ratio'})
+_KINETIC_CHAIN_FIELDS = frozenset({'peak_velocity_sequence', 'chain_lag', 'confidence'})
+
+# Row order of the print_statistics kinetic chain tables
+_CHAIN_SEGMENTS = ('hip', 'shoulder', 'elbow', 'wrist')
+_CHAIN_LAGS = (
+    ('hip_to_shoulder', "Hip → Shoulder"),
+    ('shoulder_to_elbow', "Shoulder → Elbow"),
+    ('elbow_to_wrist', "Elbow → Wrist"),
+)
+
+def validate_swing_results(results: SwingAnalysisResults, results_dict: dict, video_path: str) -> dict:
     """
     Validate that SwingAnalysisResults contains all expected fields.
 
     Args:
         results: SwingAnalysisResults object to validate
+        results_dict: results.to_dict(), computed once by the caller
         video_path: Path to video file (for reporting)
 
     Returns:
@@ -42,17 +63,17 @@ def validate_swing_results(results: SwingAnalysisResults, video_path: str) -> di
         'warnings': []
     }
 
-    results_dict = results.to_dict()
+    # Missing sections are reported in a fixed (sorted) order
+    missing_sections = _REQUIRED_SECTIONS - results_dict.keys()
+    for section in sorted(missing_sections):
+        validation_report['valid'] = False
+        validation_report['issues'].append(f"Missing '{section}' key")
 
     # Check phases
-    if 'phases' not in results_dict:
-        validation_report['valid'] = False
-        validation_report['issues'].append("Missing 'phases' key")
-    else:
+    if 'phases' not in missing_sections:
         phases = results_dict['phases']
-        expected_phases = ['unit_turn', 'backswing', 'forward_swing', 'contact', 'follow_through']
 
-        for phase_name in expected_phases:
+        for phase_name in _EXPECTED_PHASES:
             if phase_name not in phases:
                 validation_report['valid'] = False
                 validation_report['issues'].append(f"Missing phase: {phase_name}")
@@ -62,46 +83,22 @@ def validate_swing_results(results: SwingAnalysisResults, video_path: str) -> di
                     validation_report['warnings'].append(f"Phase {phase_name} is None")
                 elif isinstance(phase_data, dict):
                     # Check required fields
-                    required_fields = ['detected', 'confidence']
-                    for field in required_fields:
-                        if field not in phase_data:
-                            validation_report['valid'] = False
-                            validation_report['issues'].append(
-                                f"Phase {phase_name} missing field: {field}"
-                            )
-
-    # Check engine metrics
-    if 'engine' not in results_dict:
-        validation_report['valid'] = False
-        validation_report['issues'].append("Missing 'engine' key")
-    else:
-        engine = results_dict['engine']
-        expected_engine_fields = ['hip_shoulder_separation', 'max_shoulder_rotation', 'max_hip_rotation']
-        for field in expected_engine_fields:
-            if field not in engine:
-                validation_report['warnings'].append(f"Engine missing field: {field}")
-
-    # Check tempo metrics
-    if 'tempo' not in results_dict:
-        validation_report['valid'] = False
-        validation_report['issues'].append("Missing 'tempo' key")
-    else:
-        tempo = results_dict['tempo']
-        expected_tempo_fields = ['backswing_duration', 'forward_swing_duration', 'swing_rhythm_ratio']
-        for field in expected_tempo_fields:
-            if field not in tempo:
-                validation_report['warnings'].append(f"Tempo missing field: {field}")
-
-    # Check kinetic chain metrics
-    if 'kinetic_chain' not in results_dict:
-        validation_report['valid'] = False
-        validation_report['issues'].append("Missing 'kinetic_chain' key")
-    else:
-        kc = results_dict['kinetic_chain']
-        expected_kc_fields = ['peak_velocity_sequence', 'chain_lag', 'confidence']
-        for field in expected_kc_fields:
-            if field not in kc:
-                validation_report['warnings'].append(f"Kinetic chain missing field: {field}")
+                    for field in sorted(_PHASE_REQUIRED_FIELDS - phase_data.keys()):
+                        validation_report['valid'] = False
+                        validation_report['issues'].append(
+                            f"Phase {phase_name} missing field: {field}"
+                        )
+
+    # Check engine, tempo and kinetic chain metrics
+    for section, expected_fields, label in (
+        ('engine', _ENGINE_FIELDS, "Engine"),
+        ('tempo', _TEMPO_FIELDS, "Tempo"),
+        ('kinetic_chain', _KINETIC_CHAIN_FIELDS, "Kinetic chain"),
+    ):
+        if section in missing_sections:
+            continue
+        for field in sorted(expected_fields - results_dict[section].keys()):
+            validation_report['warnings'].append(f"{label} missing field: {field}")
 
     # Check tracking quality
     if 'tracking_quality' not in results_dict:
@@ -123,108 +120,133 @@ def validate_swing_results(results: SwingAnalysisResults, video_path: str) -> di
     return validation_report
 
 
-def print_statistics(results: SwingAnalysisResults, video_path: str):
+def print_statistics(results: SwingAnalysisResults, results_dict: dict, video_path: str) -> str:
     """
     Print comprehensive statistics from SwingAnalysisResults.
 
+    The report is built in a buffer and written to stdout in one call, so it
+    stays contiguous when several pipelines print at once.
+
     Args:
         results: SwingAnalysisResults object
+        results_dict: results.to_dict(), computed once by the caller
         video_path: Path to video file (for reporting)
+
+    Returns:
+        str: The printed report
     """
-    print("\n" + "="*60)
-    print(f"STATISTICS FOR: {video_path}")
-    print("="*60)
+    out = io.StringIO()
 
-    results_dict = results.to_dict()
+    print("\n" + "="*60, file=out)
+    print(f"STATISTICS FOR: {video_path}", file=out)
+    print("="*60, file=out)
 
     # Overall quality
     phases_detected = results.get_phases_detected_count()
     overall_confidence = results.get_overall_confidence()
 
-    print(f"\n📊 Overall Quality:")
-    print(f"   Phases Detected: {phases_detected}/5")
-    print(f"   Overall Confidence: {overall_confidence:.2%}")
+    print(f"\n📊 Overall Quality:", file=out)
+    print(f"   Phases Detected: {phases_detected}/5", file=out)
+    print(f"   Overall Confidence: {overall_confidence:.2%}", file=out)
 
     # Phase details
-    print(f"\n🎯 Phase Detection:")
-    phases = results_dict['phases']
-    for phase_name in ['unit_turn', 'backswing', 'forward_swing', 'contact', 'follow_through']:
-        phase_data = phases.get(phase_name, {})
-        if phase_data and isinstance(phase_data, dict):
-            detected = phase_data.get('detected', False)
-            confidence = phase_data.get('confidence', 0.0)
-
-            if detected:
-                frame = phase_data.get('frame', 'N/A')
-                timestamp = phase_data.get('timestamp', 0)
-                print(f"   ✅ {phase_name:15s}: frame {frame:4}, time {timestamp:.2f}s, conf {confidence:.2%}")
-            else:
-                reason = phase_data.get('reason', 'Unknown')
-                print(f"   ❌ {phase_name:15s}: {reason}")
+    print(f"\n🎯 Phase Detection:", file=out)
+    # Normalized once: entries that aren't dicts (None) become empty and are skipped
+    phases = {
+        phase_name: phase_data if isinstance(phase_data, dict) else {}
+        for phase_name, phase_data in results_dict['phases'].items()
+    }
+    phase_rows = [(phase_name, phases.get(phase_name, {})) for phase_name in _EXPECTED_PHASES]
+    _write_rows(out, (
+        _format_phase_row(phase_name, phase_data)
+        for phase_name, phase_data in phase_rows
+        if phase_data
+    ))
 
     # Engine metrics
     engine = results_dict['engine']
     if engine.get('hip_shoulder_separation'):
-        print(f"\n💪 Engine Metrics:")
+        print(f"\n💪 Engine Metrics:", file=out)
         hip_shoulder = engine['hip_shoulder_separation']
         print(f"   Hip-Shoulder Separation: {hip_shoulder.get('max_value', 0):.1f}° "
-              f"(frame {hip_shoulder.get('frame', 'N/A')})")
+              f"(frame {hip_shoulder.get('frame', 'N/A')})", file=out)
 
         if engine.get('max_shoulder_rotation'):
             shoulder_rot = engine['max_shoulder_rotation']
             print(f"   Max Shoulder Rotation: {shoulder_rot.get('value', 0):.1f}° "
-                  f"(frame {shoulder_rot.get('frame', 'N/A')})")
+                  f"(frame {shoulder_rot.get('frame', 'N/A')})", file=out)
 
         if engine.get('max_hip_rotation'):
             hip_rot = engine['max_hip_rotation']
             print(f"   Max Hip Rotation: {hip_rot.get('value', 0):.1f}° "
-                  f"(frame {hip_rot.get('frame', 'N/A')})")
+                  f"(frame {hip_rot.get('frame', 'N/A')})", file=out)
 
     # Tempo metrics
     tempo = results_dict['tempo']
     if tempo.get('backswing_duration') is not None:
-        print(f"\n⏱️  Tempo Metrics:")
-        print(f"   Backswing Duration: {tempo['backswing_duration']:.3f}s")
+        print(f"\n⏱️  Tempo Metrics:", file=out)
+        print(f"   Backswing Duration: {tempo['backswing_duration']:.3f}s", file=out)
 
         if tempo.get('forward_swing_duration'):
-            print(f"   Forward Swing Duration: {tempo['forward_swing_duration']:.3f}s")
+            print(f"   Forward Swing Duration: {tempo['forward_swing_duration']:.3f}s", file=out)
 
         if tempo.get('swing_rhythm_ratio'):
-            print(f"   Swing Rhythm Ratio: {tempo['swing_rhythm_ratio']:.2f}")
+            print(f"   Swing Rhythm Ratio: {tempo['swing_rhythm_ratio']:.2f}", file=out)
 
     # Kinetic chain metrics
     kc = results_dict['kinetic_chain']
     if kc.get('peak_velocity_sequence'):
-        print(f"\n⛓️  Kinetic Chain:")
+        print(f"\n⛓️  Kinetic Chain:", file=out)
         sequence = kc['peak_velocity_sequence']
 
-        for segment in ['hip', 'shoulder', 'elbow', 'wrist']:
-            if segment in sequence and sequence[segment]:
-                data = sequence[segment]
-                print(f"   {segment.capitalize():8s} peak: frame {data.get('frame', 'N/A'):4}, "
-                      f"time {data.get('timestamp', 0):.2f}s, "
-                      f"vel {data.get('velocity', 0):.1f}")
+        segment_rows = [(segment, sequence.get(segment)) for segment in _CHAIN_SEGMENTS]
+        _write_rows(out, (
+            f"   {segment.capitalize():8s} peak: frame {data.get('frame', 'N/A'):4}, "
+            f"time {data.get('timestamp', 0):.2f}s, "
+            f"vel {data.get('velocity', 0):.1f}"
+            for segment, data in segment_rows
+            if data
+        ))
 
         if kc.get('chain_lag'):
             lag = kc['chain_lag']
-            print(f"\n   Lag Times:")
-            if 'hip_to_shoulder' in lag:
-                print(f"      Hip → Shoulder: {lag['hip_to_shoulder']:.3f}s")
-            if 'shoulder_to_elbow' in lag:
-                print(f"      Shoulder → Elbow: {lag['shoulder_to_elbow']:.3f}s")
-            if 'elbow_to_wrist' in lag:
-                print(f"      Elbow → Wrist: {lag['elbow_to_wrist']:.3f}s")
+            print(f"\n   Lag Times:", file=out)
+            _write_rows(out, (
+                f"      {label}: {lag[key]:.3f}s" for key, label in _CHAIN_LAGS if key in lag
+            ))
 
         if kc.get('confidence') is not None:
-            print(f"\n   Sequencing Confidence: {kc['confidence']:.2%}")
+            print(f"\n   Sequencing Confidence: {kc['confidence']:.2%}", file=out)
 
     # Tracking quality
     if results_dict.get('tracking_quality'):
         tq = results_dict['tracking_quality']
-        print(f"\n📹 Tracking Quality:")
-        print(f"   Detection Rate: {tq.get('detection_rate', 0):.2%}")
-        print(f"   High Confidence Rate: {tq.get('high_confidence_rate', 0):.2%}")
-        print(f"   Average Confidence: {tq.get('average_confidence', 0):.2%}")
+        print(f"\n📹 Tracking Quality:", file=out)
+        print(f"   Detection Rate: {tq.get('detection_rate', 0):.2%}", file=out)
+        print(f"   High Confidence Rate: {tq.get('high_confidence_rate', 0):.2%}", file=out)
+        print(f"   Average Confidence: {tq.get('average_confidence', 0):.2%}", file=out)
+
+    report = out.getvalue()
+    sys.stdout.write(report)
+    sys.stdout.flush()
+    return report
+
+
+def _format_phase_row(phase_name: str, phase_data: dict) -> str:
+    """Format one phase's line of the print_statistics phase table."""
+    if phase_data.get('detected', False):
+        frame = phase_data.get('frame', 'N/A')
+        timestamp = phase_data.get('timestamp', 0)
+        confidence = phase_data.get('confidence', 0.0)
+        return f"   ✅ {phase_name:15s}: frame {frame:4}, time {timestamp:.2f}s, conf {confidence:.2%}"
+    return f"   ❌ {phase_name:15s}: {phase_data.get('reason', 'Unknown')}"
+
+
+def _write_rows(out, rows):
+    """Write formatted table rows to out with a single join (nothing if empty)."""
+    text = '\n'.join(rows)
+    if text:
+        out.write(text + '\n')
 
 
 def test_pipeline(video_path: str, output_dir: str = "test_results") -> dict:
@@ -255,17 +277,16 @@ def test_pipeline(video_path: str, output_dir: str = "test_results") -> dict:
     }
 
     try:
-        # Check if video exists
-        if not os.path.exists(video_path):
+        # Step 1: Process video. The cache lookup stats the file first, which
+        # doubles as the existence check
+        print("\n[Step 1] Processing video with VideoProcessor...")
+        try:
+            video_data = process_video_cached(video_path, pose_config=PRESET_DIFFICULT_VIDEO)
+        except FileNotFoundError:
             test_results['status'] = 'skipped'
             test_results['error'] = f"Video not found: {video_path}"
             print(f"⚠️  Skipping - video not found: {video_path}")
             return test_results
-
-        # Step 1: Process video
-        print("\n[Step 1] Processing video with VideoProcessor...")
-        processor = VideoProcessor(pose_config=PRESET_DIFFICULT_VIDEO)
-        video_data = processor.process_video(video_path)
         print(f"  ✅ Processed {video_data['frame_count']} frames at {video_data['fps']} fps")
 
         # Step 2: Analyze swing
@@ -284,7 +305,9 @@ def test_pipeline(video_path: str, output_dir: str = "test_results") -> dict:
 
         # Step 3: Validate results
         print("\n[Step 3] Validating SwingAnalysisResults...")
-        validation = validate_swing_results(results, video_path)
+        # Converted once, shared by validation, JSON output and statistics
+        results_dict = results.to_dict()
+        validation = validate_swing_results(results, results_dict, video_path)
         test_results['validation'] = validation
 
         if not validation['valid']:
@@ -292,44 +315,63 @@ def test_pipeline(video_path: str, output_dir: str = "test_results") -> dict:
             test_results['error'] = 'Validation failed'
             return test_results
 
-        # Step 4: Create visualization
-        print("\n[Step 4] Creating annotated video...")
+        # Step 4: Create visualization. It re-decodes and re-renders the whole
+        # video, so it runs in a background process while Steps 5-7 proceed
+        print("\n[Step 4] Creating annotated video (in background)...")
         video_filename = os.path.basename(video_path)
         output_video_path = os.path.join(output_dir, f"annotated_{video_filename}")
 
-        returned_path = visualize_swing_phases(
-            video_path=video_path,
-            analysis_results=results,
-            output_path=output_video_path
-        )
-
-        test_results['output_video'] = returned_path
-        print(f"  ✅ Video saved to: {returned_path}")
-
-        # Step 5: Generate JSON output
-        print("\n[Step 5] Generating JSON output...")
-        json_output_path = os.path.join(output_dir, f"analysis_{video_filename}.json")
-
-        json_data = results.to_dict()
-        with open(json_output_path, 'w') as f:
-            json.dump(json_data, f, indent=2)
-
-        test_results['json_output'] = json_output_path
-        print(f"  ✅ JSON saved to: {json_output_path}")
-
-        # Step 6: Print statistics
-        print_statistics(results, video_path)
-
-        # Step 7: Print example JSON (first 50 lines)
-        print("\n[Example JSON Output - First 50 lines]")
-        print("-" * 60)
-        json_str = results.to_json(indent=2)
-        lines = json_str.split('\n')
-        for i, line in enumerate(lines[:50]):
-            print(line)
-        if len(lines) > 50:
-            print(f"... ({len(lines) - 50} more lines)")
-        print("-" * 60)
+        # A single render process per pipeline, shut down with it. Spawned,
+        # not forked: MediaPipe and OpenCV have started threads in this
+        # process (itself a test_all_videos worker), and forking a
+        # multithreaded process can deadlock
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=multiprocessing.get_context('spawn')) as render_pool:
+            visualization = render_pool.submit(
+                visualize_swing_phases,
+                video_path=video_path,
+                analysis_results=results,
+                output_path=output_video_path
+            )
+            try:
+                # Step 5: Generate JSON output
+                print("\n[Step 5] Generating JSON output...")
+                json_output_path = os.path.join(output_dir, f"analysis_{video_filename}.json")
+
+                # Serialized once, the same string is reused for the preview in Step 7
+                json_str = json.dumps(results_dict, indent=2)
+                with open(json_output_path, 'w') as f:
+                    f.write(json_str)
+
+                test_results['json_output'] = json_output_path
+                print(f"  ✅ JSON saved to: {json_output_path}")
+
+                # Step 6: Print statistics
+                print_statistics(results, results_dict, video_path)
+
+                # Step 7: Print example JSON (first 50 lines)
+                print("\n[Example JSON Output - First 50 lines]")
+                print("-" * 60)
+                # Split off only the first 50 lines; the rest stays in one piece
+                lines = json_str.split('\n', 50)
+                for line in lines[:50]:
+                    print(line)
+                if len(lines) > 50:
+                    remaining = lines[50].count('\n') + 1
+                    print(f"... ({remaining} more lines)")
+                print("-" * 60)
+            except BaseException:
+                # Don't leave the render running unobserved: drop it if it
+                # hasn't started, otherwise wait for it to end (its own
+                # error is secondary to the one being raised)
+                if not visualization.cancel():
+                    visualization.exception()
+                raise
+
+            # Step 4 (continued): Wait for the annotated video
+            returned_path = visualization.result()
+            test_results['output_video'] = returned_path
+            print(f"\n  ✅ Video saved to: {returned_path}")
 
         test_results['status'] = 'success'
         print("\n✅ Pipeline test completed successfully!")
@@ -344,8 +386,36 @@ def test_pipeline(video_path: str, output_dir: str = "test_results") -> dict:
     return test_results
 
 
+def _run_pipeline(video_path: str, description: str) -> tuple:
+    """
+    Process pool entry point for test_all_videos: test_pipeline under a header.
+
+    Runs with its output captured, so the parent can print each video's log
+    in one piece instead of interleaving the workers' output.
+
+    Returns:
+        tuple: (test results dict, captured output)
+    """
+    buffer = io.StringIO()
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        print(f"\n\n{'='*70}")
+        print(f"Testing: {video_path} ({description})")
+        print(f"{'='*70}")
+
+        result = test_pipeline(video_path)
+        result['description'] = description
+
+    return result, buffer.getvalue()
+
+
 def test_all_videos():
-    """Test pipeline with all three test videos."""
+    """
+    Test pipeline with all three test videos.
+
+    The videos are independent, so each runs in its own worker process
+    (pose extraction and analysis are CPU bound). Logs are printed per video
+    as it finishes; the summary keeps the test_videos order.
+    """
     print("\n" + "="*70)
     print("TESTING COMPLETE PIPELINE WITH ALL VIDEOS")
     print("="*70)
@@ -356,16 +426,18 @@ def test_all_videos():
         ('uploads/novak_swing.mp4', 'motion blur/slow-mo')
     ]
 
-    results = []
-
-    for video_path, description in test_videos:
-        print(f"\n\n{'='*70}")
-        print(f"Testing: {video_path} ({description})")
-        print(f"{'='*70}")
-
-        result = test_pipeline(video_path)
-        result['description'] = description
-        results.append(result)
+    results = [None] * len(test_videos)
+    max_workers = min(len(test_videos), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_run_pipeline, video_path, description): i
+            for i, (video_path, description) in enumerate(test_videos)
+        }
+        for future in as_completed(futures):
+            result, output = future.result()
+            print(output, end='')
+            results[futures[future]] = result
 
     # Print summary
     print("\n\n" + "="*70)
@@ -1,23 +1,200 @@
+import argparse
+import math
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 import cv2
 import mediapipe as mp
+import numpy as np
+
+from video_io import open_video_capture
+
+parser = argparse.ArgumentParser(description="MediaPipe pose detection test")
+parser.add_argument(
+    '--workers', type=int, default=1,
+    help="Pose detection threads (default: 1). With more than one, each thread "
+         "runs its own Pose in static image mode, so there is no tracking "
+         "between frames"
+)
+parser.add_argument(
+    '--show', action='store_true',
+    help="Draw the skeleton and play the video in a window (default: headless, "
+         "only prints landmarks)"
+)
+parser.add_argument(
+    '--fast', action='store_true',
+    help="Lite pose model with lower detection confidence; without --show, "
+         "stops after the first 5 frames. Less accurate, for checking that the "
+         "pipeline is wired up"
+)
+parser.add_argument(
+    '--stride', type=int, default=1,
+    help="Run detection on every Nth frame only (default: 1, every frame)"
+)
+args = parser.parse_args()
+if args.workers < 1:
+    parser.error("--workers must be at least 1")
+if args.stride < 1:
+    parser.error("--stride must be at least 1")
 
 print("Testing MediaPipe Pose Detection...")
 print(f"OpenCV version: {cv2.__version__}")
 
-# Initialize MediaPipe Pose
+# MediaPipe Pose settings shared by the tracking and the static (parallel) modes
 mp_pose = mp.solutions.pose
 mp_drawing = mp.solutions.drawing_utils
-pose = mp_pose.Pose(
-    static_image_mode=False,
-    model_complexity=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+POSE_OPTIONS = {
+    'model_complexity': 1,
+    'min_detection_confidence': 0.5,
+    'min_tracking_confidence': 0.5
+}
+if args.fast:
+    POSE_OPTIONS.update(model_complexity=0, min_detection_confidence=0.3)
+
+# Landmarks are printed for this many leading frames
+LANDMARK_PRINT_FRAMES = 5
+
+
+def read_frames(cap, stride=1):
+    """
+    Yield (frame_number, BGR frame) for every stride-th frame, starting at 1.
+
+    Skipped frames are only grabbed (demuxed and decoded, not converted to an
+    image), which is cheaper than read() and, unlike seeking, doesn't restart
+    decoding from the previous keyframe.
+    """
+    frame_number = 0
+    while True:
+        if frame_number % stride:
+            success = cap.grab()
+            frame = None
+        else:
+            success, frame = cap.read()
+        if not success:
+            return
+        frame_number += 1
+        if frame is not None:
+            yield frame_number, frame
+
+
+def prefetch(items, depth=4):
+    """
+    Yield from items, produced ahead of time on a background thread.
+
+    Used for frame decoding: OpenCV releases the GIL while decoding, so the
+    next frames are read while the consumer runs pose inference on the current
+    one. At most `depth` items are buffered. Closing the generator stops and
+    joins the producer thread.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+    done = object()
+
+    def put(item):
+        # Give up once the consumer has stopped, instead of blocking forever
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except Exception as e:
+            errors.append(e)
+        put(done)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        stop.set()
+        producer.join()
+
+
+def detect_sequential(frames):
+    """
+    Detect poses with one tracking-mode Pose instance.
+
+    Yields (frame_number, frame, results). The RGB conversion target is
+    allocated on the first frame and reused after that.
+    """
+    pose = mp_pose.Pose(static_image_mode=False, **POSE_OPTIONS)
+    rgb_buf = None
+    try:
+        for frame_number, frame in frames:
+            # Convert BGR to RGB for MediaPipe
+            if rgb_buf is None:
+                rgb_buf = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+
+            yield frame_number, frame, pose.process(rgb_buf)
+    finally:
+        pose.close()
+
+
+def detect_parallel(frames, workers):
+    """
+    Detect poses on a thread pool, one static-mode Pose instance per thread.
+
+    A Pose instance is single threaded and, in tracking mode, depends on the
+    previous frame, so each thread gets its own instance treating every frame
+    independently. At most 2 * workers frames are in flight; results are
+    yielded in frame order as (frame_number, frame, results).
+    """
+    local = threading.local()
+    poses = []
+    poses_lock = threading.Lock()
+
+    def detect(frame):
+        pose = getattr(local, 'pose', None)
+        if pose is None:
+            pose = local.pose = mp_pose.Pose(static_image_mode=True, **POSE_OPTIONS)
+            with poses_lock:
+                poses.append(pose)
+        # Frames are in flight concurrently, so each gets its own RGB image
+        return pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    pending = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for frame_number, frame in frames:
+                pending.append((frame_number, frame, executor.submit(detect, frame)))
+                if len(pending) == 2 * workers:
+                    frame_number, frame, future = pending.popleft()
+                    yield frame_number, frame, future.result()
+
+            while pending:
+                frame_number, frame, future = pending.popleft()
+                yield frame_number, frame, future.result()
+    finally:
+        for pose in poses:
+            pose.close()
+
 
 # Change this to your video filename
 video_path = "uploads/test_swing.mp4"
 
-cap = cv2.VideoCapture(video_path)
+# Decode with one FFmpeg thread per core (the codec splits frames/slices
+# across them), so decoding doesn't serialize behind pose inference
+cap = open_video_capture(video_path, (cv2.CAP_PROP_N_THREADS, os.cpu_count() or 1))
 
 if not cap.isOpened():
     print(f"Error: Could not open video file: {video_path}")
@@ -27,37 +204,37 @@ fps = cap.get(cv2.CAP_PROP_FPS)
 frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
 print(f"Video loaded: {frame_count} frames at {fps} FPS")
-print("Press 'q' to quit")
+if args.show:
+    print("Press 'q' to quit")
 
-frame_number = 0
+frames = read_frames(cap, args.stride)
+if args.fast and not args.show:
+    # Headless fast run: the landmark dump is all that's left to check
+    frames = islice(frames, math.ceil(LANDMARK_PRINT_FRAMES / args.stride))
 
-while True:
-    success, frame = cap.read()
-    
-    if not success:
-        print("End of video")
-        break
-    
-    frame_number += 1
-    
-    # Convert BGR to RGB for MediaPipe
-    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    
-    # Process with MediaPipe
-    results = pose.process(image_rgb)
-    
-    # Draw skeleton on frame if pose detected
+# Decode on a background thread so it overlaps with pose inference
+frames = prefetch(frames)
+
+if args.workers > 1:
+    print(f"Detecting on {args.workers} threads (static image mode)")
+    detections = detect_parallel(frames, args.workers)
+else:
+    detections = detect_sequential(frames)
+
+for frame_number, frame, results in detections:
     if results.pose_landmarks:
-        mp_drawing.draw_landmarks(
-            frame,
-            results.pose_landmarks,
-            mp_pose.POSE_CONNECTIONS,
-            mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-            mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2)
-        )
-        
+        # Draw skeleton on frame if it's going to be shown
+        if args.show:
+            mp_drawing.draw_landmarks(
+                frame,
+                results.pose_landmarks,
+                mp_pose.POSE_CONNECTIONS,
+                mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2)
+            )
+
         # Print key landmarks for first 5 frames
-        if frame_number <= 5:
+        if frame_number <= LANDMARK_PRINT_FRAMES:
             right_shoulder = results.pose_landmarks.landmark[12]
             right_elbow = results.pose_landmarks.landmark[14]
             right_wrist = results.pose_landmarks.landmark[16]
@@ -67,17 +244,27 @@ while True:
             print(f"  Right Wrist: ({right_wrist.x:.3f}, {right_wrist.y:.3f})")
     else:
         print(f"Frame {frame_number}: No pose detected")
-    
+
+    # Headless runs skip rendering and the 25 ms per frame playback wait
+    if not args.show:
+        continue
+
     # Add frame info
-    cv2.putText(frame, f"Frame: {frame_number}/{frame_count}", 
+    cv2.putText(frame, f"Frame: {frame_number}/{frame_count}",
                 (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-    
+
     cv2.imshow('MediaPipe Pose Detection - Press Q to quit', frame)
-    
+
     if cv2.waitKey(25) & 0xFF == ord('q'):
         break
+else:
+    print("End of video")
 
+# Stops the detection workers and closes the Pose instances, then the
+# decoding thread (before the capture it reads from is released)
+detections.close()
+frames.close()
 cap.release()
-cv2.destroyAllWindows()
-pose.close()
-print("\nTest complete!")
\ No newline at end of file
+if args.show:
+    cv2.destroyAllWindows()
+print("\nTest complete!")
@@ -0,0 +1,115 @@
+"""
+Buffered test output
+
+The tests print a line per check; writing each one to the terminal as it
+happens (flushed per line on some consoles) costs more than the checks
+themselves. These helpers collect a test's prints in memory and write them
+in one call, and run independent tests or videos in worker processes with
+each one's output printed in one piece.
+"""
+
+import functools
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+
+# Buffer of the active capture_output, if any
+_capture_buffer = None
+
+
+@contextmanager
+def capture_output():
+    """
+    Collect stdout and stderr in a StringIO while the body runs.
+
+    Yields the buffer. A capture inside another one yields the outer buffer
+    instead of stacking a second StringIO, so a buffered test run through
+    run_captured holds its output once.
+    """
+    global _capture_buffer
+    if _capture_buffer is not None:
+        yield _capture_buffer
+        return
+
+    buffer = _capture_buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer), redirect_stderr(buffer):
+            yield buffer
+    finally:
+        _capture_buffer = None
+
+
+@contextmanager
+def buffered_stdout():
+    """
+    Collect prints in memory and write them to stdout in one call on exit.
+
+    The output is written even when the body raises, so a failing test
+    still shows how far it got. Inside an outer capture (run_captured) the
+    output is left to that capture.
+    """
+    if _capture_buffer is not None:
+        yield
+        return
+
+    stdout = sys.stdout
+    buffer = io.StringIO()
+    try:
+        with capture_output() as buffer:
+            yield
+    finally:
+        stdout.write(buffer.getvalue())
+        stdout.flush()
+
+
+def buffered(test):
+    """Run a test function inside buffered_stdout."""
+    @functools.wraps(test)
+    def wrapper():
+        with buffered_stdout():
+            return test()
+    return wrapper
+
+
+def run_captured(func, *args):
+    """
+    Call func(*args) with its stdout and stderr captured.
+
+    Used as the worker entry point of process pools, so the parent can print
+    each task's log in one piece instead of interleaving the workers' output.
+
+    Returns:
+        tuple: (func's return value, captured output). If func raises, the
+        output is attached to the exception as captured_output.
+    """
+    with capture_output() as buffer:
+        try:
+            result = func(*args)
+        except Exception as e:
+            e.captured_output = buffer.getvalue()
+            raise
+    return result, buffer.getvalue()
+
+
+def run_tests_parallel(tests):
+    """
+    Run independent test functions in worker processes.
+
+    Each test's output is printed in one piece, in the order of `tests`, so
+    the log reads the same as a sequential run. The first failure is
+    re-raised after its output.
+    """
+    max_workers = min(len(tests), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_captured, test) for test in tests]
+        for future in futures:
+            try:
+                print(future.result()[1], end='')
+            except Exception as e:
+                print(getattr(e, 'captured_output', ''), end='')
+                for pending in futures:
+                    pending.cancel()
+                raise
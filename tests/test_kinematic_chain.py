@@ -7,20 +7,46 @@ Tests all kinematic chain calculation functions with various scenarios.
 import sys
 import os
 import math
+import types
+
+import numpy as np
 
 # Add parent directory to path to import kinematic_chain_utils
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from buffered_output import buffered, run_tests_parallel
 from kinematic_chain_utils import (
     calculate_hip_rotation,
     calculate_shoulder_rotation,
     calculate_knee_bend,
     calculate_trunk_lean,
     calculate_upper_arm_angle,
-    create_sample_landmarks
+    create_sample_landmarks,
+    landmarks_to_array,
+    LANDMARK_FIELDS,
+    calculate_hip_rotation_batch,
+    calculate_shoulder_rotation_batch,
+    calculate_knee_bend_batch,
+    calculate_trunk_lean_batch,
+    calculate_upper_arm_angle_batch
 )
 
+# Built once and shared by the tests that need a full set of landmarks. The
+# kinematic functions only read it; tests needing a variant copy it with
+# {**_SAMPLE_LANDMARKS, ...}.
+_SAMPLE_LANDMARKS = types.MappingProxyType(create_sample_landmarks())
+
+
+def _assert_in_range(angles, low, high, label):
+    """Assert all angles are within [low, high], listing every case that isn't."""
+    in_range = (angles >= low) & (angles <= high)  # False for NaN too
+    assert in_range.all(), (
+        f"{label} outside [{low}, {high}] for cases "
+        f"{np.flatnonzero(~in_range).tolist()}: {angles[~in_range]}"
+    )
 
+
+@buffered
 def test_hip_rotation():
     """Test hip rotation calculations."""
     print("\n" + "="*60)
@@ -74,6 +100,7 @@ def test_hip_rotation():
     print("="*60)
 
 
+@buffered
 def test_shoulder_rotation():
     """Test shoulder rotation calculations."""
     print("\n" + "="*60)
@@ -122,6 +149,7 @@ def test_shoulder_rotation():
     print("="*60)
 
 
+@buffered
 def test_knee_bend():
     """Test knee bend calculations."""
     print("\n" + "="*60)
@@ -173,11 +201,22 @@ def test_knee_bend():
     assert 0 <= angle <= 180, "Knee angle should be in range [0, 180]"
     print(f"  ✅ Angle in valid range")
 
+    # Test 6: The cases above as one batch (straight right, 90°, straight left)
+    print("\n[Test 6] Testing batch knee bend")
+    hip = np.array([[0.6, 0.5, 0], [0.6, 0.5, 0], [0.4, 0.5, 0]])
+    knee = np.array([[0.6, 0.7, 0], [0.6, 0.7, 0], [0.4, 0.7, 0]])
+    ankle = np.array([[0.6, 0.9, 0], [0.7, 0.7, 0], [0.4, 0.9, 0]])
+    angles = calculate_knee_bend_batch(hip, knee, ankle)
+    np.testing.assert_array_less([170, 85, 170], angles)
+    np.testing.assert_array_less(angles, [180.001, 95, 180.001])
+    print(f"  Knee angles: {np.round(angles, 2)} ✅")
+
     print("\n" + "="*60)
     print("✅ KNEE BEND TESTS PASSED")
     print("="*60)
 
 
+@buffered
 def test_trunk_lean():
     """Test trunk lean calculations."""
     print("\n" + "="*60)
@@ -232,6 +271,7 @@ def test_trunk_lean():
     print("="*60)
 
 
+@buffered
 def test_upper_arm_angle():
     """Test upper arm angle calculations."""
     print("\n" + "="*60)
@@ -294,18 +334,29 @@ def test_upper_arm_angle():
     assert 0 <= angle <= 180, "Upper arm angle should be in range [0, 180]"
     print(f"  ✅ Angle in valid range")
 
+    # Test 7: The cases above as one batch (down, horizontal, up, left down)
+    print("\n[Test 7] Testing batch upper arm angle")
+    shoulder = np.array([[0.6, 0.3, 0], [0.6, 0.3, 0], [0.6, 0.3, 0], [0.4, 0.3, 0]])
+    elbow = np.array([[0.6, 0.5, 0], [0.8, 0.3, 0], [0.6, 0.1, 0], [0.4, 0.5, 0]])
+    hip = np.array([[0.6, 0.6, 0], [0.6, 0.6, 0], [0.6, 0.6, 0], [0.4, 0.6, 0]])
+    angles = calculate_upper_arm_angle_batch(shoulder, elbow, hip)
+    np.testing.assert_array_less([-0.001, 80, 160, -0.001], angles)
+    np.testing.assert_array_less(angles, [20, 100, 180.001, 20])
+    print(f"  Upper arm angles: {np.round(angles, 2)} ✅")
+
     print("\n" + "="*60)
     print("✅ UPPER ARM ANGLE TESTS PASSED")
     print("="*60)
 
 
+@buffered
 def test_sample_landmarks():
     """Test the sample landmarks helper function."""
     print("\n" + "="*60)
     print("TESTING SAMPLE LANDMARKS HELPER")
     print("="*60)
 
-    landmarks = create_sample_landmarks()
+    landmarks = _SAMPLE_LANDMARKS
 
     # Check that all required landmarks are present
     required_landmarks = [
@@ -346,6 +397,7 @@ def test_sample_landmarks():
     print("="*60)
 
 
+@buffered
 def test_edge_cases():
     """Test edge cases and error handling."""
     print("\n" + "="*60)
@@ -390,16 +442,163 @@ def test_edge_cases():
     print("="*60)
 
 
+@buffered
+def test_batch_kernels():
+    """Test the batch variants against the per-frame functions."""
+    print("\n" + "="*60)
+    print("TESTING BATCH KERNELS")
+    print("="*60)
+
+    names = (
+        'left_hip', 'right_hip', 'left_shoulder', 'right_shoulder',
+        'right_elbow', 'right_knee', 'right_ankle'
+    )
+    sample = _SAMPLE_LANDMARKS
+    cases = [
+        sample,
+        # Rotated hips and shoulders, leaning trunk
+        {**sample,
+         'left_hip': {'x': 0.4, 'y': 0.5, 'z': 0.1},
+         'right_hip': {'x': 0.6, 'y': 0.5, 'z': -0.1},
+         'left_shoulder': {'x': 0.4, 'y': 0.3, 'z': -0.15},
+         'right_shoulder': {'x': 0.6, 'y': 0.3, 'z': 0.15}},
+        # 90-degree knee bend, arm horizontal
+        {**sample,
+         'right_ankle': {'x': 0.7, 'y': 0.7, 'z': 0},
+         'right_elbow': {'x': 0.8, 'y': 0.3, 'z': 0}},
+        # Degenerate: knee on the hip, elbow on the shoulder
+        {**sample,
+         'right_knee': {'x': 0.6, 'y': 0.5, 'z': 0.0},
+         'right_elbow': {'x': 0.6, 'y': 0.3, 'z': 0.0}},
+        # Hip without z: the upper arm angle only needs its y
+        {**sample, 'right_hip': {'x': 0.6, 'y': 0.5}},
+        # Missing, None and malformed landmarks
+        {},
+        {'left_hip': None, 'right_hip': None},
+        {'left_hip': {'x': 'invalid'}},
+    ]
+    xyz = landmarks_to_array(cases, names)
+    lh, rh, ls, rs, re, rk, ra = (xyz[:, j] for j in range(len(names)))
+
+    # Test 1: Array layout, NaN for missing landmarks
+    print("\n[Test 1] Testing landmarks_to_array layout")
+    assert xyz.shape == (len(cases), len(names), 3)
+    np.testing.assert_array_equal(xyz[0, 0], [0.4, 0.5, 0.0])
+    assert np.isnan(xyz[5:]).all(), "Missing landmarks should be NaN"
+    assert np.isnan(xyz[4, 1, 2]) and not np.isnan(xyz[4, 1, :2]).any()
+    print(f"  ✅ {xyz.shape} array, NaN for missing landmarks")
+
+    # Test 2: Batch results match the per-frame functions case by case
+    print("\n[Test 2] Testing batch results against per-frame functions")
+    checks = [
+        ("Hip rotation", calculate_hip_rotation_batch(lh, rh), calculate_hip_rotation, -180),
+        ("Shoulder rotation", calculate_shoulder_rotation_batch(ls, rs), calculate_shoulder_rotation, -180),
+        ("Knee bend", calculate_knee_bend_batch(rh, rk, ra), calculate_knee_bend, 0),
+        ("Trunk lean", calculate_trunk_lean_batch(lh, rh, ls, rs), calculate_trunk_lean, -180),
+        ("Upper arm", calculate_upper_arm_angle_batch(rs, re, rh), calculate_upper_arm_angle, 0),
+    ]
+    for label, batch, scalar, low in checks:
+        expected = [scalar(landmarks) for landmarks in cases]
+        np.testing.assert_allclose(batch, expected, atol=1e-9, err_msg=label)
+        _assert_in_range(batch, low, 180, label)
+        print(f"  {label}: {np.round(batch, 2)} ✅")
+
+    # Test 3: Expected angles for the known poses
+    print("\n[Test 3] Testing expected angles")
+    knee = calculate_knee_bend_batch(rh, rk, ra)
+    np.testing.assert_allclose(knee[[0, 2]], [180.0, 90.0], atol=5)
+    np.testing.assert_allclose(knee[3:], 180.0)  # Degenerate and missing default to straight
+    arm = calculate_upper_arm_angle_batch(rs, re, rh)
+    np.testing.assert_allclose(arm[2], 90.0, atol=10)
+    print("  ✅ Straight/bent knee, horizontal arm and defaults as expected")
+
+    # Test 4: float32 [x, y, z, visibility] rows, as in VideoProcessor's landmarks_array
+    print("\n[Test 4] Testing landmarks_array layout (float32, with visibility)")
+    records = landmarks_to_array(cases, names, dtype=np.float32, fields=LANDMARK_FIELDS)
+    assert records.shape == (len(cases), len(names), 4)
+    assert records[0, 0, 3] == np.float32(sample['left_hip']['visibility'])
+    lh4, rh4, ls4, rs4, re4, rk4, ra4 = (records[:, j] for j in range(len(names)))
+    np.testing.assert_allclose(calculate_knee_bend_batch(rh4, rk4, ra4), knee, atol=1e-3)
+    np.testing.assert_allclose(calculate_upper_arm_angle_batch(rs4, re4, rh4), arm, atol=1e-3)
+    np.testing.assert_allclose(
+        calculate_trunk_lean_batch(lh4, rh4, ls4, rs4),
+        calculate_trunk_lean_batch(lh, rh, ls, rs), atol=1e-3
+    )
+    print("  ✅ Visibility column ignored, float32 results match")
+
+    print("\n" + "="*60)
+    print("✅ BATCH KERNEL TESTS PASSED")
+    print("="*60)
+
+
+@buffered
+def test_hip_rotation_sweep():
+    """Sweep hip rotation over a range of depth offsets in one batch."""
+    print("\n" + "="*60)
+    print("TESTING HIP ROTATION SWEEP")
+    print("="*60)
+
+    # Left hip moves back as the right hip moves forward by the same amount
+    z = np.linspace(-0.2, 0.2, 64)
+    left_hip = np.stack([np.full_like(z, 0.4), np.full_like(z, 0.5), z], axis=-1)
+    right_hip = np.stack([np.full_like(z, 0.6), np.full_like(z, 0.5), -z], axis=-1)
+    angles = calculate_hip_rotation_batch(left_hip, right_hip)
+
+    print(f"\n[Test 1] Testing {len(z)} offsets from z={z[0]} to z={z[-1]}")
+    _assert_in_range(angles, -90, 90, "Hip rotation")
+    assert np.all(np.diff(angles) < 0), "Hip rotation should decrease as z increases"
+    np.testing.assert_allclose(angles, np.degrees(np.arctan2(-2 * z, 0.2)))
+    assert angles[len(z) // 2 - 1] > 0 > angles[len(z) // 2], "Sign should flip at z=0"
+    print(f"  Angles: {angles[0]:.2f}° → {angles[-1]:.2f}° ✅ (strictly decreasing)")
+
+    print("\n" + "="*60)
+    print("✅ HIP ROTATION SWEEP PASSED")
+    print("="*60)
+
+
+@buffered
+def test_knee_bend_sweep():
+    """Sweep knee bend from a straight leg to fully folded in one batch."""
+    print("\n" + "="*60)
+    print("TESTING KNEE BEND SWEEP")
+    print("="*60)
+
+    # Ankle swings around the knee, starting straight below it
+    bend = np.linspace(0, 180, 91)
+    theta = np.radians(bend)
+    n = len(bend)
+    hip = np.tile([0.6, 0.5, 0.0], (n, 1))
+    knee = np.tile([0.6, 0.7, 0.0], (n, 1))
+    ankle = knee + 0.2 * np.stack([np.sin(theta), np.cos(theta), np.zeros(n)], axis=-1)
+    angles = calculate_knee_bend_batch(hip, knee, ankle)
+
+    print(f"\n[Test 1] Testing {n} bends from {bend[0]:.0f}° to {bend[-1]:.0f}°")
+    _assert_in_range(angles, 0, 180, "Knee bend")
+    np.testing.assert_allclose(angles, 180 - bend, atol=1e-6)
+    assert np.all(np.diff(angles) < 0), "Knee angle should decrease as the leg bends"
+    print(f"  Angles: {angles[0]:.2f}° → {angles[-1]:.2f}° ✅ (180° minus the bend)")
+
+    print("\n" + "="*60)
+    print("✅ KNEE BEND SWEEP PASSED")
+    print("="*60)
+
+
 if __name__ == "__main__":
     """Run all tests."""
     try:
-        test_hip_rotation()
-        test_shoulder_rotation()
-        test_knee_bend()
-        test_trunk_lean()
-        test_upper_arm_angle()
-        test_sample_landmarks()
-        test_edge_cases()
+        # The tests are independent, so each runs in its own worker process
+        run_tests_parallel([
+            test_hip_rotation,
+            test_shoulder_rotation,
+            test_knee_bend,
+            test_trunk_lean,
+            test_upper_arm_angle,
+            test_sample_landmarks,
+            test_edge_cases,
+            test_batch_kernels,
+            test_hip_rotation_sweep,
+            test_knee_bend_sweep,
+        ])
         print("\n🎉 All kinematic chain tests completed successfully!\n")
     except AssertionError as e:
         print(f"\n❌ Test failed: {e}\n")
@@ -6,20 +6,85 @@ Tests the video processing and tracking quality assessment functionality.
 
 import sys
 import os
+import functools
+import multiprocessing
+import pickle
+import tempfile
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
 
 # Add parent directory to path to import video_processor
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from buffered_output import buffered
+from utils import LANDMARK_NAMES
+import video_processor
 from video_processor import (
     VideoProcessor,
     PoseConfig,
     PRESET_HIGH_QUALITY,
     PRESET_FAST,
     PRESET_DIFFICULT_VIDEO,
-    PRESET_SLOW_MOTION
+    PRESET_SLOW_MOTION,
+    process_video_cached,
+    read_video_frames
 )
 
 
+def _shared_processor(pose_config=None):
+    """
+    VideoProcessor for tests that don't process a video, shared per config.
+
+    Creating a processor builds a MediaPipe Pose graph, so tests with equal
+    configs reuse one. process_video closes the graph, so tests that process
+    a video create their own processor instead.
+    """
+    return _processor_for(PoseConfig() if pose_config is None else pose_config)
+
+
+@functools.lru_cache(maxsize=8)
+def _processor_for(pose_config):
+    return VideoProcessor(pose_config=pose_config)
+
+
+@functools.lru_cache(maxsize=2)
+def _decoded_video(video_path):
+    """Frames of a test video, decoded once per run (see read_video_frames)."""
+    return read_video_frames(video_path)
+
+
+# Landmarks of a clearly visible pose, shared by the tracking quality edge
+# cases; read only (tests needing a variant build a new dict from it)
+_PERFECT_LANDMARKS = types.MappingProxyType({
+    'left_shoulder': {'x': 0.5, 'y': 0.3, 'z': 0.0, 'visibility': 0.99},
+    'right_shoulder': {'x': 0.5, 'y': 0.3, 'z': 0.0, 'visibility': 0.99},
+    'left_elbow': {'x': 0.4, 'y': 0.5, 'z': 0.0, 'visibility': 0.99},
+    'right_elbow': {'x': 0.6, 'y': 0.5, 'z': 0.0, 'visibility': 0.99},
+    'left_wrist': {'x': 0.3, 'y': 0.7, 'z': 0.0, 'visibility': 0.99},
+    'right_wrist': {'x': 0.7, 'y': 0.7, 'z': 0.0, 'visibility': 0.99},
+    'left_hip': {'x': 0.5, 'y': 0.6, 'z': 0.0, 'visibility': 0.99},
+    'right_hip': {'x': 0.5, 'y': 0.6, 'z': 0.0, 'visibility': 0.99}
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _perfect_landmarks_tensor(frames=10):
+    """
+    _PERFECT_LANDMARKS for every frame, as process_video's (N, L, 4) landmarks_array.
+
+    Built once per frame count and shared between tests, so it is read only.
+    """
+    row = [tuple(_PERFECT_LANDMARKS[name][field] for field in ('x', 'y', 'z', 'visibility'))
+           for name in LANDMARK_NAMES]
+    tensor = np.broadcast_to(np.array(row, dtype=np.float32), (frames, len(row), 4)).copy()
+    tensor.flags.writeable = False
+    return tensor
+
+
+@buffered
 def test_tracking_quality():
     """Test tracking quality assessment on sample video."""
     print("\n" + "="*60)
@@ -36,7 +101,7 @@ def test_tracking_quality():
 
     print(f"\n[Test 1] Processing video: {test_video_path}")
     processor = VideoProcessor()
-    video_data = processor.process_video(test_video_path)
+    video_data = processor.process_frames(**_decoded_video(test_video_path))
 
     # Verify tracking_quality is in the returned data
     print(f"\n[Test 2] Verifying tracking_quality in video_data")
@@ -95,13 +160,14 @@ def test_tracking_quality():
     print("\n✅ All tracking quality assessment tests passed")
 
 
+@buffered
 def test_tracking_quality_edge_cases():
     """Test edge cases for tracking quality assessment."""
     print("\n" + "="*60)
     print("TESTING EDGE CASES")
     print("="*60)
 
-    processor = VideoProcessor()
+    processor = _shared_processor()
 
     # Test 1: Empty frames list
     print("\n[Test 1] Testing with empty frames list")
@@ -138,25 +204,14 @@ def test_tracking_quality_edge_cases():
 
     # Test 3: Perfect detection
     print("\n[Test 3] Testing with perfect detection")
-    perfect_landmarks = {
-        'left_shoulder': {'x': 0.5, 'y': 0.3, 'z': 0.0, 'visibility': 0.99},
-        'right_shoulder': {'x': 0.5, 'y': 0.3, 'z': 0.0, 'visibility': 0.99},
-        'left_elbow': {'x': 0.4, 'y': 0.5, 'z': 0.0, 'visibility': 0.99},
-        'right_elbow': {'x': 0.6, 'y': 0.5, 'z': 0.0, 'visibility': 0.99},
-        'left_wrist': {'x': 0.3, 'y': 0.7, 'z': 0.0, 'visibility': 0.99},
-        'right_wrist': {'x': 0.7, 'y': 0.7, 'z': 0.0, 'visibility': 0.99},
-        'left_hip': {'x': 0.5, 'y': 0.6, 'z': 0.0, 'visibility': 0.99},
-        'right_hip': {'x': 0.5, 'y': 0.6, 'z': 0.0, 'visibility': 0.99}
-    }
     perfect_data = {
         'fps': 30,
         'frame_count': 10,
         'width': 1920,
         'height': 1080,
-        'frames': [
-            {'frame_number': i, 'timestamp': i/30, 'pose_detected': True, 'landmarks': perfect_landmarks}
-            for i in range(1, 11)
-        ]
+        # process_video's array layout; no per-frame dicts needed
+        'pose_detected': np.ones(10, dtype=bool),
+        'landmarks_array': _perfect_landmarks_tensor()
     }
     quality = processor.assess_tracking_quality(perfect_data)
     assert quality['detection_rate'] == 1.0, "Detection rate should be 1.0 for perfect detection"
@@ -167,19 +222,95 @@ def test_tracking_quality_edge_cases():
     print(f"  Average confidence: {quality['average_confidence']:.3f}")
     print("  ✅ Perfect detection handled correctly")
 
+    # Test 4: Mixed detection, from frame dicts and from process_video's arrays
+    print("\n[Test 4] Testing mixed detection (frame dicts vs landmark arrays)")
+    low_landmarks = {
+        name: {**lm, 'visibility': 0.5} for name, lm in _PERFECT_LANDMARKS.items()
+    }
+    mixed_frames = [
+        {'frame_number': i, 'timestamp': i/30, 'pose_detected': landmarks is not None,
+         'landmarks': landmarks}
+        for i, landmarks in enumerate(
+            [_PERFECT_LANDMARKS, low_landmarks, None, _PERFECT_LANDMARKS], start=1
+        )
+    ]
+    mixed_data = {'fps': 30, 'frame_count': 4, 'width': 1920, 'height': 1080, 'frames': mixed_frames}
+    quality = processor.assess_tracking_quality(mixed_data)
+    assert quality['detection_rate'] == 0.75
+    assert quality['high_confidence_rate'] == 0.5, "2 of 4 frames average above 0.7"
+    assert abs(quality['average_confidence'] - (0.99 * 2 + 0.5) / 3) < 1e-9
+
+    mixed_data['pose_detected'] = np.array([f['pose_detected'] for f in mixed_frames])
+    mixed_data['landmarks_array'] = np.array([
+        [(lm['x'], lm['y'], lm['z'], lm['visibility']) for lm in f['landmarks'].values()]
+        if f['landmarks'] else [(np.nan,) * 4] * len(_PERFECT_LANDMARKS)
+        for f in mixed_frames
+    ], dtype=np.float32)
+    array_quality = processor.assess_tracking_quality(mixed_data)
+    for key, value in quality.items():
+        assert abs(array_quality[key] - value) < 1e-6, f"{key} differs with landmark arrays"
+    print(f"  Detection rate: {quality['detection_rate']:.2f}")
+    print(f"  High confidence rate: {quality['high_confidence_rate']:.2f}")
+    print(f"  Average confidence: {quality['average_confidence']:.3f}")
+    print("  ✅ Same metrics from frame dicts and landmark arrays")
+
     print("\n✅ All edge case tests passed")
 
 
+# Videos checked by test_multiple_videos, where present
+MULTI_VIDEO_PATHS = (
+    'uploads/test_swing.mp4',
+    'uploads/novakswing.mp4',
+    'uploads/novak_swing.mp4',
+)
+
+
+def _process_one(video_path):
+    """
+    Tracking quality of one video, for test_multiple_videos.
+
+    Runs in a worker process, which builds its own VideoProcessor since a
+    processor can't be reused after process_video.
+    """
+    video_data = VideoProcessor().process_video(video_path)
+    return video_data['frame_count'], video_data['tracking_quality']
+
+
+@buffered
 def test_multiple_videos():
     """Test tracking quality on multiple videos if available."""
     print("\n" + "="*60)
     print("TESTING MULTIPLE VIDEOS")
     print("="*60)
-    print("\n⚠️  Note: Skipping multi-video test due to MediaPipe processor reuse limitation")
-    print("  Each video requires a new VideoProcessor instance")
-    print("="*60)
 
+    existing = [path for path in MULTI_VIDEO_PATHS if os.path.exists(path)]
+    if not existing:
+        print("⚠️  Skipping test - no test videos found in uploads/")
+        return
 
+    # Each video is decoded and run through MediaPipe in its own process.
+    # Workers are spawned, not forked: earlier tests leave live MediaPipe
+    # graphs (and their threads) in this process, and forking a
+    # multithreaded parent can deadlock
+    print(f"\n[Test 1] Processing {len(existing)} video(s) in parallel")
+    workers = min(len(existing), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        results = list(executor.map(_process_one, existing))
+
+    for video_path, (frame_count, tracking_quality) in zip(existing, results):
+        print(f"  {video_path}: {frame_count} frames, "
+              f"detection rate {tracking_quality['detection_rate']*100:.1f}%")
+        assert frame_count > 0, f"No frames processed for {video_path}"
+        for metric in ('detection_rate', 'high_confidence_rate', 'average_confidence'):
+            value = tracking_quality[metric]
+            assert 0 <= value <= 1, f"{metric} {value} not in range [0, 1] for {video_path}"
+    print("  ✅ Tracking quality valid for every video")
+
+    print("\n✅ Multiple video tests passed")
+
+
+@buffered
 def test_pose_config():
     """Test pose configuration functionality."""
     print("\n" + "="*60)
@@ -202,6 +333,18 @@ def test_pose_config():
     assert custom_config.smooth_landmarks == True  # default
     print("  ✅ Custom config created successfully")
 
+    # Test 1b: Configs are immutable values
+    print("\n[Test 1b] Testing config immutability and equality")
+    assert custom_config == PoseConfig(model_complexity=1, min_detection_confidence=0.4,
+                                       min_tracking_confidence=0.4)
+    assert hash(PoseConfig()) == hash(PoseConfig())
+    assert PRESET_FAST != PoseConfig()
+    try:
+        custom_config.model_complexity = 2
+        assert False, "Should not allow modifying a config"
+    except AttributeError:
+        print("  ✅ Configs compare by value and can't be modified")
+
     # Test 2: Config validation
     print("\n[Test 2] Testing config parameter validation")
     try:
@@ -252,21 +395,21 @@ def test_pose_config():
     # Test 6: VideoProcessor with custom config
     print("\n[Test 6] Testing VideoProcessor with custom config")
     config = PoseConfig(model_complexity=1, min_detection_confidence=0.4)
-    processor = VideoProcessor(pose_config=config)
+    processor = _shared_processor(config)
     assert processor.pose_config.model_complexity == 1
     assert processor.pose_config.min_detection_confidence == 0.4
     print("  ✅ VideoProcessor initialized with custom config")
 
     # Test 7: VideoProcessor with default config
     print("\n[Test 7] Testing VideoProcessor with default config")
-    processor = VideoProcessor()
+    processor = _shared_processor()
     assert processor.pose_config.model_complexity == 1  # default
     assert processor.pose_config.min_detection_confidence == 0.5  # default
     print("  ✅ VideoProcessor initialized with default config")
 
     # Test 8: VideoProcessor with preset config
     print("\n[Test 8] Testing VideoProcessor with PRESET_DIFFICULT_VIDEO")
-    processor = VideoProcessor(pose_config=PRESET_DIFFICULT_VIDEO)
+    processor = _shared_processor(PRESET_DIFFICULT_VIDEO)
     assert processor.pose_config.model_complexity == 2
     assert processor.pose_config.min_detection_confidence == 0.3
     print("  ✅ VideoProcessor initialized with preset config")
@@ -310,6 +453,148 @@ def test_pose_config():
     print("="*60)
 
 
+@buffered
+def test_process_video_cached():
+    """Test that processed videos are cached on disk per video and pose config."""
+    print("\n" + "="*60)
+    print("TESTING CACHED VIDEO PROCESSING")
+    print("="*60)
+
+    test_video = 'uploads/test_swing.mp4'
+    if not os.path.exists(test_video):
+        print(f"⚠️  Skipping test - video not found: {test_video}")
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Test 1: First call processes the video and writes one cache entry
+        print("\n[Test 1] First call processes and caches the video")
+        video_data = process_video_cached(test_video, cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 1
+        print("  ✅ Cache entry written")
+
+        # Test 2: Second call loads the same data from the cache
+        print("\n[Test 2] Second call loads from the cache")
+        cached = process_video_cached(test_video, cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 1
+        assert cached['frame_count'] == video_data['frame_count']
+        assert cached['frames'] == video_data['frames']
+        print("  ✅ Cached video data matches")
+
+        # Test 3: A different pose config gets its own entry
+        print("\n[Test 3] Different pose config is cached separately")
+        process_video_cached(test_video, pose_config=PRESET_FAST, cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 2
+        print("  ✅ Separate cache entry per config")
+
+    print("\n✅ Cached processing tests passed")
+
+
+@buffered
+def test_video_cache_invalidation():
+    """Test that the cache format version and failed writes are handled."""
+    print("\n" + "="*60)
+    print("TESTING VIDEO CACHE INVALIDATION")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        video_path = os.path.join(tmp_dir, 'noise.avi')
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+        rng = np.random.default_rng(0)
+        for _ in range(4):
+            writer.write(rng.integers(0, 256, (48, 64, 3), dtype=np.uint8))
+        writer.release()
+        cache_dir = os.path.join(tmp_dir, 'cache')
+
+        # Test 1: A new format version ignores entries written by older code
+        print("\n[Test 1] Format version is part of the cache key")
+        process_video_cached(video_path, cache_dir=cache_dir)
+        version = video_processor.VIDEO_CACHE_FORMAT_VERSION
+        video_processor.VIDEO_CACHE_FORMAT_VERSION = version + 1
+        try:
+            process_video_cached(video_path, cache_dir=cache_dir)
+        finally:
+            video_processor.VIDEO_CACHE_FORMAT_VERSION = version
+        assert len(os.listdir(cache_dir)) == 2, "New version should write its own entry"
+        print("  ✅ Separate cache entry per format version")
+
+        # Test 2: A failed write leaves no temporary file behind
+        print("\n[Test 2] Failed cache write is cleaned up")
+        def failing_dump(*args, **kwargs):
+            raise pickle.PicklingError("simulated failure")
+        dump = pickle.dump
+        pickle.dump = failing_dump
+        try:
+            process_video_cached(video_path, pose_config=PoseConfig(min_detection_confidence=0.4),
+                                 cache_dir=cache_dir)
+            assert False, "Should propagate the pickling error"
+        except pickle.PicklingError:
+            pass
+        finally:
+            pickle.dump = dump
+        assert len(os.listdir(cache_dir)) == 2, f"Unexpected files: {os.listdir(cache_dir)}"
+        print("  ✅ No partial cache file left")
+
+        # Test 3: A truncated entry is a cache miss and gets replaced
+        print("\n[Test 3] Truncated cache file is reprocessed")
+        truncated_dir = os.path.join(tmp_dir, 'truncated')
+        video_data = process_video_cached(video_path, cache_dir=truncated_dir)
+        (entry,) = os.listdir(truncated_dir)
+        entry_path = os.path.join(truncated_dir, entry)
+        with open(entry_path, 'r+b') as f:
+            f.truncate(os.path.getsize(entry_path) // 2)
+        reprocessed = process_video_cached(video_path, cache_dir=truncated_dir)
+        assert reprocessed['frames'] == video_data['frames']
+        with open(entry_path, 'rb') as f:
+            assert pickle.load(f)['frame_count'] == video_data['frame_count']
+        print("  ✅ Truncated entry replaced")
+
+    print("\n✅ Cache invalidation tests passed")
+
+
+@buffered
+def test_process_frames():
+    """Test that processing decoded frames matches processing the file."""
+    print("\n" + "="*60)
+    print("TESTING PROCESS FRAMES")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Small noise video (no pose), MJPG so any OpenCV build can write it
+        video_path = os.path.join(tmp_dir, 'noise.avi')
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+        rng = np.random.default_rng(0)
+        for _ in range(12):
+            writer.write(rng.integers(0, 256, (48, 64, 3), dtype=np.uint8))
+        writer.release()
+
+        # Test 1: Whole video decoded into one array
+        print("\n[Test 1] Decoding the video into memory")
+        decoded = read_video_frames(video_path)
+        assert decoded['frames'].shape == (12, 48, 64, 3)
+        assert decoded['frames'].dtype == np.uint8
+        assert decoded['frame_count'] == 12
+        assert (decoded['width'], decoded['height']) == (64, 48)
+        print(f"  ✅ {decoded['frames'].shape} frames at {decoded['fps']} FPS")
+
+        # Test 2: Same video data as process_video
+        print("\n[Test 2] Comparing process_frames with process_video")
+        from_file = VideoProcessor().process_video(video_path)
+        from_frames = VideoProcessor().process_frames(**decoded)
+        assert from_frames['frames'] == from_file['frames']
+        assert from_frames['tracking_quality'] == from_file['tracking_quality']
+        np.testing.assert_array_equal(from_frames['pose_detected'], from_file['pose_detected'])
+        print("  ✅ Frames and tracking quality match")
+
+        # Test 3: Size and count default to the array's shape
+        print("\n[Test 3] Defaults from the frames array")
+        video_data = VideoProcessor().process_frames(decoded['frames'], fps=30.0)
+        assert video_data['frame_count'] == 12
+        assert (video_data['width'], video_data['height']) == (64, 48)
+        print("  ✅ Frame count and size taken from the array")
+
+    print("\n✅ Process frames tests passed")
+
+
 if __name__ == "__main__":
     """Run all tests."""
     try:
@@ -317,6 +602,9 @@ if __name__ == "__main__":
         test_tracking_quality_edge_cases()
         test_pose_config()
         test_multiple_videos()
+        test_process_video_cached()
+        test_video_cache_invalidation()
+        test_process_frames()
         print("\n🎉 All video processor tests completed successfully!\n")
     except AssertionError as e:
         print(f"\n❌ Test failed: {e}\n")
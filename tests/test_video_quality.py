@@ -11,13 +11,20 @@ Tests the video quality checking functionality including:
 
 import sys
 import os
+import tempfile
+
+import cv2
+import numpy as np
 
 # Add parent directory to path to import video_quality_checker
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from buffered_output import buffered
+import video_quality_checker
 from video_quality_checker import check_video_quality
 
 
+@buffered
 def test_video_quality_checker():
     """Test video quality checker on sample videos."""
     print("\n" + "="*60)
@@ -137,6 +144,76 @@ def test_video_quality_checker():
     print("="*60 + "\n")
 
 
+def _write_video(path, frames, fps=30):
+    """Write BGR frames to an MJPG video (writable by any OpenCV build)."""
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+@buffered
+def test_brightness_and_sharpness():
+    """Test brightness and sharpness on generated videos with known content."""
+    print("\n" + "="*60)
+    print("TESTING BRIGHTNESS AND SHARPNESS")
+    print("="*60)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Test 1: Flat dark frames are too dark and have no detail
+        print("\n[Test 1] Flat dark video")
+        dark_path = os.path.join(tmp_dir, 'dark.avi')
+        _write_video(dark_path, [np.full((240, 320, 3), 40, dtype=np.uint8)] * 45)
+        report = check_video_quality(dark_path)
+        print(f"  Brightness: {report['brightness']:.1f}/255, Sharpness: {report['sharpness']:.1f}")
+        assert abs(report['brightness'] - 40) < 2, "Brightness should be the flat gray level"
+        assert report['sharpness'] < 1, "A flat image has no Laplacian response"
+        assert any('dark' in w.lower() for w in report['warnings'])
+        assert any('sharpness' in w.lower() for w in report['warnings'])
+        assert isinstance(report['brightness'], float) and isinstance(report['sharpness'], float)
+        print("  ✅ Dark and blur warnings raised")
+
+        # Test 2: Bright noise is sharp; only the low resolution is flagged
+        print("\n[Test 2] Bright noisy video")
+        noise_path = os.path.join(tmp_dir, 'noise.avi')
+        _write_video(noise_path, [
+            rng.integers(100, 256, (240, 320, 3), dtype=np.uint8) for _ in range(45)
+        ])
+        report = check_video_quality(noise_path)
+        print(f"  Brightness: {report['brightness']:.1f}/255, Sharpness: {report['sharpness']:.1f}")
+        assert report['brightness'] > 150
+        assert report['sharpness'] > 100
+        assert report['warnings'] == [
+            "Resolution 320x240 is below recommended 720p (1280x720)"
+        ]
+        assert report['is_acceptable'] is False
+        print("  ✅ Only the resolution warning raised")
+
+        # Test 3: Skipping by grabbing frames samples the same frames as seeking
+        print("\n[Test 3] Grab-skipping vs seeking between samples")
+        levels_path = os.path.join(tmp_dir, 'levels.avi')
+        _write_video(levels_path, [
+            np.full((48, 64, 3), (i * 37) % 256, dtype=np.uint8) for i in range(95)
+        ])
+        grabbed = check_video_quality(levels_path)
+        max_grab_skip = video_quality_checker.MAX_GRAB_SKIP
+        video_quality_checker.MAX_GRAB_SKIP = 0
+        try:
+            seeked = check_video_quality(levels_path)
+        finally:
+            video_quality_checker.MAX_GRAB_SKIP = max_grab_skip
+        assert grabbed['brightness'] == seeked['brightness']
+        assert grabbed['sharpness'] == seeked['sharpness']
+        print(f"  ✅ Same brightness ({grabbed['brightness']:.1f}) either way")
+
+    print("\n" + "="*60)
+    print("✅ BRIGHTNESS AND SHARPNESS TESTS PASSED")
+    print("="*60 + "\n")
+
+
+@buffered
 def test_error_handling():
     """Test error handling for invalid inputs."""
     print("\n" + "="*60)
@@ -168,6 +245,7 @@ if __name__ == "__main__":
     """Run all tests."""
     try:
         test_video_quality_checker()
+        test_brightness_and_sharpness()
         test_error_handling()
         print("🎉 All tests completed successfully!\n")
     except AssertionError as e:
@@ -1,27 +1,43 @@
-import numpy as np
 import math
 
+# Pose landmarks tracked for swing analysis, in the order used by
+# landmark arrays (axis 1 of video_data['landmarks_array'])
+LANDMARK_NAMES = (
+    'left_shoulder',
+    'right_shoulder',
+    'left_elbow',
+    'right_elbow',
+    'left_wrist',
+    'right_wrist',
+    'left_hip',
+    'right_hip',
+)
+
 def calculate_angle(point_a, point_b, point_c):
     """
     Calculate angle at point B given three points A, B, C
     Returns angle in degrees
+
+    Uses scalar math instead of building NumPy arrays: this is called once
+    per frame from the analyzer loop, where the array setup dominated.
     """
-    # Convert to numpy arrays
-    a = np.array([point_a['x'], point_a['y']])
-    b = np.array([point_b['x'], point_b['y']])
-    c = np.array([point_c['x'], point_c['y']])
-    
     # Vectors
-    ba = a - b
-    bc = c - b
-    
+    ba_x = point_a['x'] - point_b['x']
+    ba_y = point_a['y'] - point_b['y']
+    bc_x = point_c['x'] - point_b['x']
+    bc_y = point_c['y'] - point_b['y']
+
+    norm_product = math.hypot(ba_x, ba_y) * math.hypot(bc_x, bc_y)
+    if norm_product == 0:
+        # Degenerate triangle (coincident points), angle is undefined
+        return float('nan')
+
     # Angle calculation
-    cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
+    cosine_angle = (ba_x * bc_x + ba_y * bc_y) / norm_product
     # Clamp to avoid numerical errors
-    cosine_angle = np.clip(cosine_angle, -1.0, 1.0)
-    angle = np.arccos(cosine_angle)
-    
-    return np.degrees(angle)
+    cosine_angle = min(1.0, max(-1.0, cosine_angle))
+
+    return math.degrees(math.acos(cosine_angle))
 
 def calculate_velocity(current_pos, previous_pos, time_delta):
     """
@@ -34,10 +50,7 @@ def calculate_velocity(current_pos, previous_pos, time_delta):
     dx = current_pos['x'] - previous_pos['x']
     dy = current_pos['y'] - previous_pos['y']
     
-    distance = math.sqrt(dx**2 + dy**2)
-    velocity = distance / time_delta
-    
-    return velocity
+    return math.hypot(dx, dy) / time_delta
 
 def get_body_center_x(left_shoulder, right_shoulder):
     """Get x-coordinate of body center (midpoint between shoulders)"""
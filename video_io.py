@@ -0,0 +1,39 @@
+"""
+Video I/O
+
+Opening videos for decoding, shared by the pose processor, the quality
+checker and the test scripts. Kept apart from utils so the analysis code
+doesn't load OpenCV just to compute angles.
+
+Author: Tennis-CV Project
+"""
+
+import cv2
+
+
+def open_video_capture(video_path, params=()):
+    """
+    Open a video for decoding, hardware accelerated where available.
+
+    Asks the FFmpeg backend for any hardware decoder (VAAPI, D3D11, ...);
+    FFmpeg decodes in software when there is none, which
+    cap.get(cv2.CAP_PROP_HW_ACCELERATION) then reports as 0. Falls back to
+    OpenCV's default backend if FFmpeg can't open the file. Check
+    isOpened() on the result.
+
+    Args:
+        video_path (str): Path to the video file
+        params (sequence): Extra FFmpeg capture properties as flat
+            (property, value) pairs, e.g. (cv2.CAP_PROP_N_THREADS, 4)
+
+    Returns:
+        cv2.VideoCapture: The capture, which may not be opened
+    """
+    cap = cv2.VideoCapture(
+        video_path, cv2.CAP_FFMPEG,
+        [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY, *params]
+    )
+    if not cap.isOpened():
+        # FFmpeg backend unavailable, fall back to the default one
+        cap = cv2.VideoCapture(video_path)
+    return cap
@@ -1,8 +1,70 @@
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+
 import cv2
 import mediapipe as mp
 import numpy as np
 
+from utils import LANDMARK_NAMES
+from video_io import open_video_capture
+
+# MediaPipe Pose indices of the landmarks in LANDMARK_NAMES
+LANDMARK_INDICES = {
+    'left_shoulder': 11,
+    'right_shoulder': 12,
+    'left_elbow': 13,
+    'right_elbow': 14,
+    'left_wrist': 15,
+    'right_wrist': 16,
+    'left_hip': 23,
+    'right_hip': 24
+}
+
+_MISSING_LANDMARK_ROW = [(np.nan, np.nan, np.nan, np.nan)] * len(LANDMARK_NAMES)
+
+# Default directory for process_video_cached
+VIDEO_CACHE_DIR = '.cache'
+
+# Version of the video_data layout in process_video_cached's pickles. Bump it
+# whenever process_video's output changes, so older cache entries are ignored
+VIDEO_CACHE_FORMAT_VERSION = 1
+
+
+def _frame_confidences(frames):
+    """
+    Count detected frames and average the landmark visibilities of each.
+
+    For frame dicts without process_video's arrays. The visibilities of all
+    frames are collected into one flat array in a single pass, then summed
+    per frame with np.add.reduceat.
 
+    Returns:
+        tuple: (number of detected frames, float64 array of the average
+            visibility of each detected frame that has landmarks)
+    """
+    landmark_dicts = []
+    detected_count = 0
+    for frame in frames:
+        if frame['pose_detected']:
+            detected_count += 1
+            if frame['landmarks']:
+                landmark_dicts.append(frame['landmarks'])
+
+    if not landmark_dicts:
+        return detected_count, np.empty(0)
+
+    counts = np.fromiter(map(len, landmark_dicts), dtype=np.intp, count=len(landmark_dicts))
+    visibilities = np.fromiter(
+        (lm['visibility'] for landmarks in landmark_dicts for lm in landmarks.values()),
+        dtype=np.float64, count=int(counts.sum())
+    )
+    starts = np.concatenate(([0], np.cumsum(counts[:-1])))
+    return detected_count, np.add.reduceat(visibilities, starts) / counts
+
+
+@dataclass(slots=True, frozen=True)
 class PoseConfig:
     """
     Configuration class for MediaPipe Pose detection.
@@ -18,30 +80,26 @@ class PoseConfig:
         min_detection_confidence (float): Minimum confidence for initial detection (0.0-1.0)
         min_tracking_confidence (float): Minimum confidence for tracking (0.0-1.0)
         smooth_landmarks (bool): Whether to smooth landmarks across frames
+
+    Instances are immutable and compare and hash by value, so equal configs
+    can share cached results (see process_video_cached).
     """
 
-    def __init__(
-        self,
-        model_complexity=1,
-        static_image_mode=False,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5,
-        smooth_landmarks=True
-    ):
-        # Validate parameters
-        if model_complexity not in [0, 1, 2]:
+    model_complexity: int = 1
+    static_image_mode: bool = False
+    min_detection_confidence: float = 0.5
+    min_tracking_confidence: float = 0.5
+    smooth_landmarks: bool = True
+
+    def __post_init__(self):
+        """Validate parameters."""
+        if self.model_complexity not in [0, 1, 2]:
             raise ValueError("model_complexity must be 0, 1, or 2")
-        if not 0.0 <= min_detection_confidence <= 1.0:
+        if not 0.0 <= self.min_detection_confidence <= 1.0:
             raise ValueError("min_detection_confidence must be between 0.0 and 1.0")
-        if not 0.0 <= min_tracking_confidence <= 1.0:
+        if not 0.0 <= self.min_tracking_confidence <= 1.0:
             raise ValueError("min_tracking_confidence must be between 0.0 and 1.0")
 
-        self.model_complexity = model_complexity
-        self.static_image_mode = static_image_mode
-        self.min_detection_confidence = min_detection_confidence
-        self.min_tracking_confidence = min_tracking_confidence
-        self.smooth_landmarks = smooth_landmarks
-
     def to_dict(self):
         """Return configuration as dictionary for MediaPipe Pose initialization."""
         return {
@@ -52,13 +110,6 @@ class PoseConfig:
             'smooth_landmarks': self.smooth_landmarks
         }
 
-    def __repr__(self):
-        return (f"PoseConfig(model_complexity={self.model_complexity}, "
-                f"static_image_mode={self.static_image_mode}, "
-                f"min_detection_confidence={self.min_detection_confidence}, "
-                f"min_tracking_confidence={self.min_tracking_confidence}, "
-                f"smooth_landmarks={self.smooth_landmarks})")
-
 
 # Preset configurations for common use cases
 PRESET_HIGH_QUALITY = PoseConfig(
@@ -120,7 +171,7 @@ class VideoProcessor:
         Process entire video and extract pose landmarks for each frame
         Returns: list of frame data with landmarks and metadata
         """
-        cap = cv2.VideoCapture(video_path)
+        cap = open_video_capture(video_path)
         
         if not cap.isOpened():
             raise ValueError(f"Could not open video file: {video_path}")
@@ -131,22 +182,51 @@ class VideoProcessor:
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         
+        try:
+            return self.process_frames(_iter_frames(cap), fps, frame_count, width, height)
+        finally:
+            cap.release()
+
+    def process_frames(self, frames, fps, frame_count=None, width=None, height=None):
+        """
+        Extract pose landmarks from already decoded frames.
+
+        process_video decodes the file and delegates here. Callers holding the
+        frames in memory (see read_video_frames) skip the decode. Like
+        process_video, this closes the Pose graph when done, so a processor
+        handles one video.
+
+        Args:
+            frames: BGR uint8 frames, an (N, H, W, 3) array or any iterable
+            fps (float): Frame rate, used for timestamps
+            frame_count (int, optional): Frame count to report (default: len(frames))
+            width, height (int, optional): Frame size (default: from the
+                shape of frames, which must then be an array)
+
+        Returns:
+            dict: video_data, as returned by process_video
+        """
+        if frame_count is None:
+            frame_count = len(frames)
+        if width is None or height is None:
+            height, width = frames.shape[1:3]
+
         print(f"Processing video: {frame_count} frames at {fps} FPS")
         
         frames_data = []
+        landmark_rows = []
         frame_number = 0
+        # RGB conversion target, allocated on the first frame and reused after that
+        image_rgb = None
         
-        while cap.isOpened():
-            success, frame = cap.read()
-            
-            if not success:
-                break
-            
+        for frame in frames:
             frame_number += 1
             timestamp = frame_number / fps
             
             # Convert to RGB for MediaPipe
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if image_rgb is None:
+                image_rgb = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=image_rgb)
             
             # Process with MediaPipe
             results = self.pose.process(image_rgb)
@@ -162,6 +242,14 @@ class VideoProcessor:
             if results.pose_landmarks:
                 frame_data['pose_detected'] = True
                 frame_data['landmarks'] = self._extract_landmarks(results.pose_landmarks)
+                landmark_rows.append(
+                    [
+                        (lm['x'], lm['y'], lm['z'], lm['visibility'])
+                        for lm in frame_data['landmarks'].values()
+                    ]
+                )
+            else:
+                landmark_rows.append(_MISSING_LANDMARK_ROW)
             
             frames_data.append(frame_data)
             
@@ -169,7 +257,6 @@ class VideoProcessor:
             if frame_number % 30 == 0:
                 print(f"Processed {frame_number}/{frame_count} frames...")
         
-        cap.release()
         self.pose.close()
 
         print(f"Processing complete! {frame_number} frames processed.")
@@ -180,7 +267,18 @@ class VideoProcessor:
             'frame_count': frame_count,
             'width': width,
             'height': height,
-            'frames': frames_data
+            'frames': frames_data,
+            # Per-frame detection mask, lets consumers select valid frames
+            # without walking the frame dicts
+            'pose_detected': np.fromiter(
+                (f['pose_detected'] for f in frames_data), dtype=bool, count=len(frames_data)
+            ),
+            # (frames, landmarks, [x, y, z, visibility]) in LANDMARK_NAMES order,
+            # NaN where no pose was detected. float32 is ample for normalized
+            # coordinates and a fraction of the size of the per-frame dicts
+            'landmarks_array': np.array(landmark_rows, dtype=np.float32).reshape(
+                len(landmark_rows), len(LANDMARK_NAMES), 4
+            )
         }
 
         # Assess tracking quality
@@ -204,7 +302,9 @@ class VideoProcessor:
         Assess the quality of pose tracking across all frames.
 
         Args:
-            video_data: Dictionary containing processed frame data
+            video_data: Dictionary containing processed frame data. Uses the
+                'pose_detected' mask and 'landmarks_array' when present (only
+                those two are needed then), otherwise the 'frames' dicts.
 
         Returns:
             dict: Tracking quality metrics including:
@@ -212,8 +312,10 @@ class VideoProcessor:
                 - high_confidence_rate: Percentage of frames with avg confidence > 0.7 (0-1)
                 - average_confidence: Mean confidence across all detected frames (0-1)
         """
-        frames = video_data['frames']
-        total_frames = len(frames)
+        detected = video_data.get('pose_detected')
+        landmarks_array = video_data.get('landmarks_array')
+        use_arrays = detected is not None and landmarks_array is not None
+        total_frames = len(detected) if use_arrays else len(video_data['frames'])
 
         if total_frames == 0:
             return {
@@ -222,37 +324,26 @@ class VideoProcessor:
                 'average_confidence': 0.0
             }
 
-        # Count frames with pose detected
-        detected_frames = [f for f in frames if f['pose_detected']]
-        detection_rate = len(detected_frames) / total_frames
+        # Average visibility (confidence) of each detected frame with landmarks
+        if use_arrays:
+            # (frames, landmarks, [x, y, z, visibility]) as built by process_video
+            detected_count = int(np.count_nonzero(detected))
+            frame_confidences = landmarks_array[detected, :, 3].mean(axis=1, dtype=np.float64)
+        else:
+            detected_count, frame_confidences = _frame_confidences(video_data['frames'])
 
         # Calculate confidence metrics for detected frames
-        if not detected_frames:
+        if detected_count == 0:
             return {
                 'detection_rate': 0.0,
                 'high_confidence_rate': 0.0,
                 'average_confidence': 0.0
             }
 
-        # Calculate average visibility (confidence) for each frame
-        frame_confidences = []
-        high_confidence_frames = 0
-
-        for frame in detected_frames:
-            landmarks = frame['landmarks']
-            if landmarks:
-                # Get visibility scores for all landmarks
-                visibilities = [lm['visibility'] for lm in landmarks.values()]
-                avg_visibility = sum(visibilities) / len(visibilities)
-                frame_confidences.append(avg_visibility)
-
-                # Count frames with high confidence (>0.7)
-                if avg_visibility > 0.7:
-                    high_confidence_frames += 1
-
-        # Calculate overall metrics
-        average_confidence = sum(frame_confidences) / len(frame_confidences) if frame_confidences else 0.0
-        high_confidence_rate = high_confidence_frames / total_frames
+        # Calculate overall metrics (high confidence: average visibility > 0.7)
+        detection_rate = detected_count / total_frames
+        average_confidence = float(frame_confidences.mean()) if frame_confidences.size else 0.0
+        high_confidence_rate = int(np.count_nonzero(frame_confidences > 0.7)) / total_frames
 
         return {
             'detection_rate': detection_rate,
@@ -265,18 +356,8 @@ class VideoProcessor:
         landmarks = {}
 
         # Key landmarks for tennis swing analysis
-        landmark_indices = {
-            'left_shoulder': 11,
-            'right_shoulder': 12,
-            'left_elbow': 13,
-            'right_elbow': 14,
-            'left_wrist': 15,
-            'right_wrist': 16,
-            'left_hip': 23,
-            'right_hip': 24
-        }
-
-        for name, idx in landmark_indices.items():
+        for name in LANDMARK_NAMES:
+            idx = LANDMARK_INDICES[name]
             landmark = pose_landmarks.landmark[idx]
             landmarks[name] = {
                 'x': landmark.x,
@@ -288,6 +369,130 @@ class VideoProcessor:
         return landmarks
 
 
+def _iter_frames(cap):
+    """Yield the remaining frames of an opened cv2.VideoCapture."""
+    while True:
+        success, frame = cap.read()
+        if not success:
+            return
+        yield frame
+
+
+def read_video_frames(video_path):
+    """
+    Decode a whole video into one (N, H, W, 3) uint8 BGR array.
+
+    For callers that run several passes over the same video (e.g. tests),
+    so it is decoded once. The result's keys match the arguments of
+    VideoProcessor.process_frames:
+
+        processor.process_frames(**read_video_frames(video_path))
+
+    Args:
+        video_path (str): Path to the video file
+
+    Returns:
+        dict: 'frames', 'fps', 'frame_count' (frames actually decoded),
+            'width' and 'height'
+
+    Raises:
+        ValueError: If the video cannot be opened
+    """
+    cap = open_video_capture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video file: {video_path}")
+
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        # The container's frame count is an estimate: size the buffer by it,
+        # then grow or trim to what was actually decoded
+        frames = np.empty(
+            (max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 1), height, width, 3), dtype=np.uint8
+        )
+        count = 0
+        for frame in _iter_frames(cap):
+            if count == len(frames):
+                frames = np.concatenate([frames, np.empty_like(frames)])
+            frames[count] = frame
+            count += 1
+    finally:
+        cap.release()
+
+    return {
+        'frames': frames[:count],
+        'fps': fps,
+        'frame_count': count,
+        'width': width,
+        'height': height
+    }
+
+
+def process_video_cached(video_path, pose_config=None, cache_dir=VIDEO_CACHE_DIR):
+    """
+    Process a video with VideoProcessor, reusing a pickled result from disk.
+
+    Pose extraction is the expensive step of the pipeline, and the test
+    scripts run the same videos through it repeatedly. The cache key covers
+    the video path, modification time and size, the pose configuration and
+    VIDEO_CACHE_FORMAT_VERSION, so an edited video, a different config or a
+    changed video_data layout is processed again.
+
+    Args:
+        video_path (str): Path to the video file
+        pose_config (PoseConfig, optional): Pose configuration (default: PoseConfig())
+        cache_dir (str): Directory holding the cached results
+
+    Returns:
+        dict: video_data, as returned by VideoProcessor.process_video
+    """
+    if pose_config is None:
+        pose_config = PoseConfig()
+
+    stat = os.stat(video_path)
+    config_key = sorted(pose_config.to_dict().items())
+    key = hashlib.blake2b(
+        f"{VIDEO_CACHE_FORMAT_VERSION}|{os.path.abspath(video_path)}|"
+        f"{stat.st_mtime_ns}|{stat.st_size}|{config_key}".encode(),
+        digest_size=16
+    ).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{key}.pkl")
+
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # Truncated (killed writer) or stale (classes moved since it was
+        # written) entry: treat it as a miss and replace it
+        try:
+            os.remove(cache_path)
+        except FileNotFoundError:
+            pass
+
+    video_data = VideoProcessor(pose_config=pose_config).process_video(video_path)
+
+    # Write under a per-process name and rename, so concurrent test workers
+    # never read a partially written file
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(video_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        # Don't leave a partial file behind
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return video_data
+
+
 # Test the processor
 if __name__ == "__main__":
     processor = VideoProcessor()
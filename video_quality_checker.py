@@ -12,6 +12,15 @@ import cv2
 import numpy as np
 from typing import Dict, List, Tuple
 
+from video_io import open_video_capture
+
+# Longest gap between sampled frames that is skipped by grabbing frames
+# rather than seeking. grab() decodes a frame without converting it to an
+# image, while a seek restarts decoding from the previous keyframe (often
+# around a second of video before the target), so grabbing is cheaper for
+# short gaps.
+MAX_GRAB_SKIP = 30
+
 
 def check_video_quality(video_path: str) -> Dict:
     """
@@ -40,7 +49,7 @@ def check_video_quality(video_path: str) -> Dict:
         ValueError: If video cannot be opened or is corrupted
     """
     # Open video file
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video_capture(video_path)
 
     if not cap.isOpened():
         raise ValueError(f"Cannot open video file: {video_path}")
@@ -67,39 +76,52 @@ def check_video_quality(video_path: str) -> Dict:
     sample_interval = max(1, frame_count // 30)
     sample_count = min(30, frame_count // sample_interval)
 
-    brightness_values = []
-    sharpness_values = []
+    brightness_values = np.empty(max(sample_count, 0))
+    sharpness_values = np.empty(max(sample_count, 0))
+
+    # Grayscale and Laplacian images, allocated on the first sample and
+    # reused after that
+    gray = None
+    laplacian = None
 
     frame_idx = 0
     samples_collected = 0
+    seek = sample_interval > MAX_GRAB_SKIP
 
     while samples_collected < sample_count:
-        # Jump to next sample frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        # Jump to next sample frame: seek for long gaps, otherwise grab the
+        # frames in between (the read position is just past the last sample)
+        if seek:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        elif samples_collected and not all(cap.grab() for _ in range(sample_interval - 1)):
+            break
         ret, frame = cap.read()
 
         if not ret:
             break
 
-        # Calculate brightness (average pixel intensity)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        avg_brightness = np.mean(gray)
-        brightness_values.append(avg_brightness)
+        if gray is None:
+            gray = np.empty(frame.shape[:2], dtype=np.uint8)
+            laplacian = np.empty(frame.shape[:2], dtype=np.float64)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
 
         # Calculate sharpness using Laplacian variance
         # Higher variance = sharper image, lower variance = more blur
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-        variance = laplacian.var()
-        sharpness_values.append(variance)
+        cv2.Laplacian(gray, cv2.CV_64F, dst=laplacian)
+        _, stddev = cv2.meanStdDev(laplacian)
+
+        # Brightness is the average pixel intensity
+        brightness_values[samples_collected] = cv2.mean(gray)[0]
+        sharpness_values[samples_collected] = stddev[0, 0] ** 2
 
         frame_idx += sample_interval
         samples_collected += 1
 
     cap.release()
 
-    # Calculate average metrics
-    avg_brightness = np.mean(brightness_values) if brightness_values else 0
-    avg_sharpness = np.mean(sharpness_values) if sharpness_values else 0
+    # Calculate average metrics (per-frame values weigh equally)
+    avg_brightness = brightness_values[:samples_collected].mean() if samples_collected else 0
+    avg_sharpness = sharpness_values[:samples_collected].mean() if samples_collected else 0
 
     # Check 3: Brightness
     if avg_brightness < 100:
@@ -56,11 +56,13 @@ def visualize_swing_phases(
         analysis_results = analyzer.analyze_swing(video_data)
 
         # Extract phases dict from SwingAnalysisResults for backward compatibility
-        phases = analysis_results.to_dict()["phases"]
+        results_dict = analysis_results.to_dict()
+        phases = results_dict["phases"]
     else:
         print("Using pre-computed analysis results...")
         # Extract phases from SwingAnalysisResults
-        phases = analysis_results.to_dict()["phases"]
+        results_dict = analysis_results.to_dict()
+        phases = results_dict["phases"]
 
         # We need to reprocess video to get frame count
         processor = VideoProcessor(pose_config=PRESET_DIFFICULT_VIDEO)
@@ -218,7 +220,7 @@ def visualize_swing_phases(
 
         # Draw engine metrics during backswing phases
         if "BACKSWING" in current_phase or "UNIT TURN" in current_phase:
-            engine_data = analysis_results.to_dict()["engine"]
+            engine_data = results_dict["engine"]
             if engine_data.get("hip_shoulder_separation"):
                 hip_shoulder_sep = engine_data["hip_shoulder_separation"].get(
                     "max_value", 0
@@ -271,7 +273,7 @@ def visualize_swing_phases(
 
         # Draw tempo metrics during finish phase
         if "FINISH" in current_phase:
-            tempo_data = analysis_results.to_dict()["tempo"]
+            tempo_data = results_dict["tempo"]
             if tempo_data.get("backswing_duration") is not None:
                 # Draw semi-transparent background for tempo metrics
                 overlay_tempo = frame.copy()
@@ -358,7 +360,7 @@ def visualize_swing_phases(
                 print(f"  ❌ {phase_name}: {reason}")
 
     # Print engine metrics
-    engine_data = analysis_results.to_dict()["engine"]
+    engine_data = results_dict["engine"]
     if engine_data.get("hip_shoulder_separation"):
         print("\nEngine Metrics:")
         print(
@@ -374,7 +376,7 @@ def visualize_swing_phases(
             )
 
     # Print tempo metrics
-    tempo_data = analysis_results.to_dict()["tempo"]
+    tempo_data = results_dict["tempo"]
     if tempo_data.get("backswing_duration") is not None:
         print("\nTempo Metrics:")
         print(f"  Backswing Duration: {tempo_data['backswing_duration']:.2f}s")